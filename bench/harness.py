@@ -0,0 +1,121 @@
+import os
+import sys
+import time
+import logging
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.support.ui import WebDriverWait
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_automation import LinkedInAutomation
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Serves bench/fixtures on a free localhost port from a background thread"""
+
+    def __init__(self, directory=FIXTURES_DIR):
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), partial(_QuietHandler, directory=directory))
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self._server.server_address[1]}/{name}"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class RoundTripCounter:
+    """Counts WebDriver commands (HTTP round trips to chromedriver) issued through `driver`"""
+
+    def __init__(self, driver):
+        self.count = 0
+        self._execute = driver.execute
+
+        def counted(command, params=None):
+            self.count += 1
+            return self._execute(command, params)
+
+        # WebElement commands are dispatched through the parent driver too
+        driver.execute = counted
+
+
+def headless_driver(driver_path=None, window_size="1366,900"):
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-gpu")
+    options.add_argument(f"--window-size={window_size}")
+    service = Service(driver_path) if driver_path else Service()
+    return webdriver.Chrome(service=service, options=options)
+
+
+def offline_automation(driver):
+    """LinkedInAutomation bound to an existing driver, skipping Chrome profile setup, Gemini and login"""
+    automation = LinkedInAutomation.__new__(LinkedInAutomation)
+    automation.email = ""
+    automation.password = ""
+    automation.api_key = ""
+    automation.model = None
+    automation.driver = driver
+    automation.wait = WebDriverWait(driver, 10)
+    automation.tracked_profiles_file = os.devnull
+    automation.tracked_store = None
+    automation.message_cache = None
+    automation.persistent_profile_dir = None
+    return automation
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    index = (len(ordered) - 1) * pct / 100
+    low = int(index)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (index - low)
+
+
+def run_operation(counter, setup, operation, iterations, warmup=1):
+    """
+    Time `operation()` `iterations` times, calling `setup()` (untimed, uncounted)
+    before each run. Returns latency percentiles in ms and round trips per run.
+    """
+    latencies, round_trips, result = [], [], None
+    for i in range(warmup + iterations):
+        setup()
+        counter.count = 0
+        started = time.perf_counter()
+        result = operation()
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            latencies.append(elapsed * 1000)
+            round_trips.append(counter.count)
+    return {
+        'iterations': iterations,
+        'p50_ms': round(percentile(latencies, 50), 1),
+        'p90_ms': round(percentile(latencies, 90), 1),
+        'p99_ms': round(percentile(latencies, 99), 1),
+        'mean_ms': round(sum(latencies) / len(latencies), 1),
+        'round_trips': round(sum(round_trips) / len(round_trips), 1),
+        'last_result': result
+    }
@@ -0,0 +1,107 @@
+"""
+Offline benchmarks for the Selenium hot paths.
+
+Serves the HTML fixtures in bench/fixtures from a local HTTP server and
+drives LinkedInAutomation against them in headless Chrome, reporting
+latency percentiles and WebDriver round trips per operation.
+
+    python bench/run_benchmarks.py --iterations 20 --json bench_results.json
+    python bench/run_benchmarks.py --baseline bench_results.json --tolerance 0.25
+
+With --baseline the run exits non-zero when an operation's p50 latency or
+round-trip count regressed by more than the tolerance, so it can gate CI.
+CI compares round trips only (--metrics round_trips) against a run of the
+base commit; latency on shared runners is too noisy to gate on.
+"""
+import os
+import sys
+import json
+import logging
+import argparse
+
+from harness import FixtureServer, RoundTripCounter, headless_driver, offline_automation, run_operation
+
+logger = logging.getLogger(__name__)
+
+
+def build_operations(automation, server):
+    """name -> (setup, operation, iterations divisor); slow flows run fewer iterations"""
+    driver = automation.driver
+
+    def load(name):
+        return lambda: driver.get(server.url(name))
+
+    return {
+        'extract_profile_data': (load('profile.html'), automation.extract_profile_data, 1),
+        'find_connect_buttons_enhanced': (load('search_page1.html'), automation.find_connect_buttons_enhanced, 1),
+        'handle_connect_modal_safe': (load('connect_modal.html'),
+                                      lambda: automation.handle_connect_modal_safe("Priya Raman"), 4),
+        'get_conversation_history': (load('messaging.html'), automation.get_conversation_history, 1),
+        'go_to_next_page': (load('search_page1.html'), automation.go_to_next_page, 1),
+    }
+
+
+COMPARED_METRICS = ('p50_ms', 'round_trips')
+
+
+def compare(results, baseline, tolerance, metrics=COMPARED_METRICS):
+    """Operations whose `metrics` grew by more than `tolerance` over the baseline"""
+    regressions = []
+    for name, stats in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for metric in metrics:
+            if base[metric] and stats[metric] > base[metric] * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {base[metric]} -> {stats[metric]}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Selenium flows against offline HTML fixtures")
+    parser.add_argument('--iterations', type=int, default=10)
+    parser.add_argument('--only', nargs='*', help="operation names to run (default: all)")
+    parser.add_argument('--driver-path', help="chromedriver executable (default: resolved by Selenium)")
+    parser.add_argument('--json', help="write results to this file")
+    parser.add_argument('--baseline', help="results file from an earlier run to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25)
+    parser.add_argument('--metrics', nargs='+', choices=COMPARED_METRICS, default=list(COMPARED_METRICS),
+                        help="metrics compared against the baseline (default: all)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(levelname)s %(name)s: %(message)s')
+
+    results = {}
+    driver = headless_driver(args.driver_path)
+    try:
+        counter = RoundTripCounter(driver)
+        automation = offline_automation(driver)
+        with FixtureServer() as server:
+            for name, (setup, operation, divisor) in build_operations(automation, server).items():
+                if args.only and name not in args.only:
+                    continue
+                stats = run_operation(counter, setup, operation, max(1, args.iterations // divisor))
+                outcome = stats.pop('last_result')
+                stats['result'] = len(outcome) if isinstance(outcome, (list, dict)) else outcome
+                results[name] = stats
+                print(f"{name:32} p50 {stats['p50_ms']:8.1f} ms  p90 {stats['p90_ms']:8.1f} ms  "
+                      f"p99 {stats['p99_ms']:8.1f} ms  round trips {stats['round_trips']:6.1f}  "
+                      f"(n={stats['iterations']}, result={stats['result']})")
+    finally:
+        driver.quit()
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), args.tolerance, args.metrics)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+import time
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class BrowserPool:
+    """
+    One warm, logged-in LinkedInAutomation shared by campaigns, searches
+    and inbox runs.
+
+    Chrome runs on a single persistent profile, so the session is leased to
+    one job at a time; waiting jobs are served in arrival order. On each
+    lease the session is health-checked with `_healthy()` and replaced when
+    it is dead, belongs to another account, has served `max_jobs` jobs or
+    Chrome has grown past `max_memory_mb`. Sessions are built by
+    `factory` (LinkedInAutomation's signature, and the default), so tests
+    can swap in a fake.
+    """
+
+    def __init__(self, max_jobs=25, max_memory_mb=1500, factory=None):
+        self.factory = factory
+        self.max_jobs = max_jobs
+        self.max_memory_mb = max_memory_mb
+        self._cond = threading.Condition()
+        self._waiters = deque()
+        self._leased = False
+        self._automation = None
+        self._account = None
+        self._jobs = 0
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, email, password, api_key, model=None, timeout=None):
+        """
+        Lease the shared session for this LinkedIn account, blocking while
+        another job holds it. Returns a logged-in LinkedInAutomation, or
+        None if login failed (or `timeout` ran out). Pair with release().
+        """
+        ticket = object()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._waiters.append(ticket)
+            try:
+                while self._leased or self._waiters[0] is not ticket:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        logger.warning("⚠️ Timed out waiting for the shared browser")
+                        return None
+                    self._cond.wait(remaining)
+                self._leased = True
+            finally:
+                self._waiters.remove(ticket)
+                self._cond.notify_all()
+
+        try:
+            automation = self._prepare(email, password, api_key, model)
+        except Exception as e:
+            logger.error(f"❌ Could not start browser session: {e}")
+            automation = None
+        if automation is None:
+            self._discard()
+            self._release_lease()
+        return automation
+
+    def _prepare(self, email, password, api_key, model):
+        automation = self._automation
+        if automation is not None:
+            reason = self._recycle_reason(email)
+            if reason is None:
+                automation.api_key = api_key
+                if model is not None:
+                    automation.model = model
+                self.reused += 1
+                logger.info(f"♻️ Reusing warm browser session (job {self._jobs + 1}/{self.max_jobs})")
+                return automation
+            logger.info(f"🔄 Recycling browser session: {reason}")
+            self._discard()
+
+        if self.factory is None:
+            # Selenium is only loaded once the first browser job arrives
+            from linkedin_automation import LinkedInAutomation
+            self.factory = LinkedInAutomation
+
+        started = time.monotonic()
+        automation = self.factory(email=email, password=password, api_key=api_key, model=model)
+        self._automation = automation
+        self._account = email
+        self._jobs = 0
+        self.created += 1
+        if not automation.login():
+            return None
+        logger.info(f"🚀 Browser session ready in {time.monotonic() - started:.1f}s")
+        return automation
+
+    def _recycle_reason(self, email):
+        if email != self._account:
+            return "different LinkedIn account"
+        if not self._automation.driver or not self._automation._healthy():
+            return "browser not responding"
+        if self._jobs >= self.max_jobs:
+            return f"served {self._jobs} jobs"
+        memory_mb = self.memory_mb()
+        if memory_mb > self.max_memory_mb:
+            return f"Chrome using {memory_mb:.0f} MB"
+        return None
+
+    def memory_mb(self):
+        """Resident memory of chromedriver plus every Chrome process it started"""
+        try:
+            import psutil
+            root = psutil.Process(self._automation.driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except Exception:
+            return 0.0
+
+    def release(self, automation, discard=False):
+        """Return a leased session; `discard=True` closes it instead of keeping it warm"""
+        if automation is None or automation is not self._automation:
+            return
+        self._jobs += 1
+        if discard:
+            self._discard()
+        else:
+            self._reset_tabs(automation)
+        self._release_lease()
+
+    def _reset_tabs(self, automation):
+        """Leave a single tab open so the next job starts from a clean window"""
+        try:
+            driver = automation.driver
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+        except Exception as e:
+            logger.debug(f"Could not reset browser tabs: {e}")
+
+    def _discard(self):
+        automation, self._automation, self._account = self._automation, None, None
+        if automation is not None:
+            try:
+                automation.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser session: {e}")
+
+    def _release_lease(self):
+        with self._cond:
+            self._leased = False
+            self._cond.notify_all()
+
+    def status(self):
+        with self._cond:
+            return {
+                'warm': self._automation is not None,
+                'leased': self._leased,
+                'waiting': len(self._waiters),
+                'jobs_on_session': self._jobs,
+                'sessions_created': self.created,
+                'sessions_reused': self.reused
+            }
+
+    def close(self, timeout=10):
+        """Shut the warm browser down, waiting up to `timeout` seconds for the current job"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: not self._leased, timeout):
+                logger.warning("⚠️ Closing the shared browser while a job is still using it")
+            self._leased = True
+        self._discard()
+        self._release_lease()
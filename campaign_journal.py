@@ -0,0 +1,118 @@
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JOURNAL_DIR = 'campaign_journal'
+
+# Campaign counters captured with every checkpoint
+CHECKPOINT_FIELDS = ('progress', 'total', 'successful', 'failed', 'skipped',
+                     'already_messaged', 'prefilter')
+
+# Never written to disk; supply them again when resuming
+SECRET_CONFIG_KEYS = ('linkedin_password', 'gemini_api_key')
+
+
+class CampaignJournal:
+    """
+    Append-only JSON-lines log of campaign progress, one file per campaign.
+
+    Records are fsync'd before append() returns, so after a crash the
+    journal covers every contact the campaign finished. load() replays a
+    journal into the checkpoint run_enhanced_outreach_campaign resumes from.
+    """
+
+    def __init__(self, journal_dir=DEFAULT_JOURNAL_DIR):
+        self.journal_dir = journal_dir
+        self._lock = threading.Lock()
+
+    def _path(self, campaign_id):
+        safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(campaign_id))
+        return os.path.join(self.journal_dir, f"{safe_id}.jsonl")
+
+    def append(self, campaign_id, event, **fields):
+        """Durably append one record to the campaign's journal"""
+        record = dict(fields, event=event, at=datetime.now().isoformat())
+        line = json.dumps(record, default=str, ensure_ascii=False) + '\n'
+        with self._lock:
+            try:
+                os.makedirs(self.journal_dir, exist_ok=True)
+                with open(self._path(campaign_id), 'a', encoding='utf-8') as f:
+                    f.write(line)
+                    f.flush()
+                    os.fsync(f.fileno())
+            except Exception as e:
+                logger.warning(f"⚠️ Could not journal {event} for campaign {campaign_id}: {e}")
+
+    def start(self, campaign_id, user_config, campaign_data):
+        safe_config = {k: v for k, v in (user_config or {}).items() if k not in SECRET_CONFIG_KEYS}
+        self.append(campaign_id, 'start', user_config=safe_config, campaign_data=campaign_data)
+
+    def checkpoint(self, campaign_id, state, event='checkpoint', **fields):
+        """Append a record carrying the campaign's current counters"""
+        self.append(campaign_id, event, state={k: state.get(k) for k in CHECKPOINT_FIELDS}, **fields)
+
+    def load(self, campaign_id):
+        """Replay a campaign's journal into a resume checkpoint, or None if it has never started"""
+        path = self._path(campaign_id)
+        if not os.path.exists(path):
+            return None
+
+        checkpoint = None
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write from a crash - everything before it is intact
+                    continue
+                event = record.get('event')
+
+                if event == 'start':
+                    checkpoint = {
+                        'user_config': record.get('user_config', {}),
+                        'campaign_data': record.get('campaign_data', {}),
+                        'state': {},
+                        'results': [],
+                        'done': {},
+                        'prefiltered_rows': set(),
+                        'pending_draft': None,
+                        'status': None
+                    }
+                    continue
+                if checkpoint is None:
+                    continue
+
+                if 'state' in record:
+                    checkpoint['state'] = record['state']
+                if event == 'prefilter':
+                    checkpoint['prefiltered_rows'].add(record['start_row'])
+                elif event == 'draft':
+                    checkpoint['pending_draft'] = record
+                elif event == 'contact':
+                    checkpoint['done'][record['row']] = record['profile']
+                    if record.get('result'):
+                        checkpoint['results'].append(record['result'])
+                    pending = checkpoint['pending_draft']
+                    if pending and pending['row'] == record['row']:
+                        checkpoint['pending_draft'] = None
+                elif event == 'end':
+                    checkpoint['status'] = record.get('status')
+                elif event == 'resume':
+                    checkpoint['status'] = None
+
+        if checkpoint is None:
+            return None
+
+        # Contacts are handled in source order, so reading can restart at the
+        # prefilter batch holding the last finished contact
+        last_done = max(checkpoint['done'], default=-1)
+        checkpoint['resume_row'] = max(
+            (row for row in checkpoint['prefiltered_rows'] if row <= last_done), default=0
+        )
+        checkpoint['done_urls'] = list(checkpoint['done'].values())
+        checkpoint['finished'] = checkpoint['status'] == 'completed'
+        return checkpoint
@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ('completed', 'failed', 'stopped')
+
+
+class CampaignRegistry(MutableMapping):
+    """
+    In-memory state for campaigns / searches with bounded retention.
+
+    Lookups never create entries (use `ensure()` for that). Runs in a
+    terminal status are kept for `ttl` seconds after they are first seen
+    finished, and at most `max_finished` of them are kept at once (oldest
+    evicted first). Runs pinned with `hold()` are never evicted, even past
+    the limit, because their worker thread may still be writing to them.
+    Evicted runs are written to `archive_dir` and can still be read back
+    with `get_archived()`.
+    """
+
+    def __init__(self, default_factory=None, archive_dir=None, ttl=3600,
+                 max_finished=50, on_evict=None):
+        self.default_factory = default_factory
+        self.archive_dir = archive_dir
+        self.ttl = ttl
+        self.max_finished = max_finished
+        self.on_evict = on_evict
+        self._data = OrderedDict()
+        self._finished_at = {}
+        self._held = {}
+        self._lock = threading.RLock()
+
+    def __getitem__(self, key):
+        with self._lock:
+            return self._data[key]
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._finished_at.pop(key, None)
+        self.prune()
+
+    def __delitem__(self, key):
+        with self._lock:
+            del self._data[key]
+            self._finished_at.pop(key, None)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._data))
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def items(self):
+        """Snapshot of (key, state) pairs, safe to iterate while runs update"""
+        with self._lock:
+            return list(self._data.items())
+
+    def ensure(self, key):
+        """Return the state for `key`, creating it from default_factory if missing"""
+        with self._lock:
+            if key not in self._data:
+                self[key] = self.default_factory() if self.default_factory else {}
+            return self._data[key]
+
+    def hold(self, key):
+        """Pin `key` while a worker thread owns it; pair with release()"""
+        with self._lock:
+            self._held[key] = self._held.get(key, 0) + 1
+
+    def release(self, key):
+        with self._lock:
+            remaining = self._held.get(key, 0) - 1
+            if remaining > 0:
+                self._held[key] = remaining
+            else:
+                self._held.pop(key, None)
+        self.prune()
+
+    def is_held(self, key):
+        with self._lock:
+            return key in self._held
+
+    def prune(self):
+        """Evict finished, unheld runs past their TTL or beyond the retention limit"""
+        now = time.monotonic()
+        evicted = []
+        with self._lock:
+            for key, state in self._data.items():
+                if state.get('status') in TERMINAL_STATUSES and key not in self._held:
+                    self._finished_at.setdefault(key, now)
+                else:
+                    self._finished_at.pop(key, None)
+
+            finished = sorted(self._finished_at.items(), key=lambda item: item[1])
+            overflow = max(0, len(finished) - self.max_finished)
+            for i, (key, finished_at) in enumerate(finished):
+                if i < overflow or now - finished_at >= self.ttl:
+                    evicted.append((key, self._data.pop(key)))
+                    del self._finished_at[key]
+
+        for key, state in evicted:
+            self._archive(key, state)
+            if self.on_evict:
+                try:
+                    self.on_evict(key)
+                except Exception as e:
+                    logger.debug(f"Eviction callback failed for {key}: {e}")
+        if evicted:
+            logger.info(f"🧹 Evicted {len(evicted)} finished runs from memory")
+        return len(evicted)
+
+    def _archive_path(self, key):
+        safe_key = "".join(c if c.isalnum() or c in "-_" else "_" for c in str(key))
+        return os.path.join(self.archive_dir, f"{safe_key}.json")
+
+    def _archive(self, key, state):
+        if not self.archive_dir:
+            return
+        try:
+            os.makedirs(self.archive_dir, exist_ok=True)
+            with open(self._archive_path(key), 'w', encoding='utf-8') as f:
+                json.dump(state, f, ensure_ascii=False, default=str)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not archive run {key}: {e}")
+
+    def get_archived(self, key):
+        """Read an evicted run's final state back from disk, or None"""
+        if not self.archive_dir:
+            return None
+        try:
+            with open(self._archive_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read archived run {key}: {e}")
+            return None
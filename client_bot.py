@@ -1,23 +1,41 @@
+# Startup timing has to begin before the heavier imports below
+import startup_profile
+startup_profile.start()
+
 import os
 import json
 import time
 import threading
 import csv
 from datetime import datetime
-from flask import Flask, request, jsonify
-import requests
-from linkedin_automation import LinkedInAutomation
+# flask, requests, pyngrok, selenium, pandas and google.generativeai are imported where they are
+# first used, so the GUI doesn't wait for them (see startup_profile / --profile-startup)
+from browser_pool import BrowserPool
+from profile_store import get_tracked_store, canonical_profile_slug
+from message_cache import get_message_cache
+from gemini_client import get_gemini_model, warm_up_model, model_health
+from page_ready import wait_until_ready, wait_until_replaced, wait_stats, SEARCH_RESULTS_MARKER
+from selector_stats import find_first
+from profile_extract import extract_profile
+from log_pipeline import configure_logging, log_context
+from tracing import traced, span, set_status, get_recorder, render_metrics
+from search_harvest import harvest_search_results, connectable, card_summary
+from contact_ingest import (
+    spool_upload, resolve_upload, discard_upload, iter_contact_file, iter_campaign_contacts, MAX_UPLOAD_BYTES
+)
+from draft_prefetch import DraftPrefetcher
+from dashboard_reporter import DashboardReporter, ProgressDeltaEncoder
+from campaign_registry import CampaignRegistry, TERMINAL_STATUSES
+from campaign_journal import CampaignJournal
 import logging
 import uuid
-from collections import defaultdict
 import PySimpleGUI as sg
 import sys
 import signal
 import atexit
-from pyngrok import ngrok
 import random
-import google.generativeai as genai
 import re
+from itertools import chain
 
 # Import all functions from LinkedIn_automation_script.py
 from urllib.parse import quote_plus
@@ -25,17 +43,11 @@ import tempfile
 import platform
 import shutil
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('client_automation.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
+# Part of the message cache key; bump when the note prompt or model changes
+NOTE_PROMPT_VERSION = 'gemini-1.5-flash/client-note-v1'
+
 class EnhancedLinkedInAutomationClient:
     def __init__(self):
         self.config_file = "client_config.json"
@@ -47,39 +59,73 @@ class EnhancedLinkedInAutomationClient:
             sys.exit(1)
         
         self.automation_instances = {}
-        self.active_campaigns = defaultdict(lambda: {
-            'user_action': None, 
-            'awaiting_confirmation': False,
-            'current_contact': None,
-            'status': 'idle'
-        })
+        # Finished runs are evicted after finished_run_ttl seconds (or beyond max_finished_runs)
+        # and their final state is kept on disk under run_archive/
+        archive_dir = self.config.get('run_archive_dir', 'run_archive')
+        self.active_campaigns = CampaignRegistry(
+            default_factory=lambda: {
+                'user_action': None, 
+                'awaiting_confirmation': False,
+                'current_contact': None,
+                'status': 'idle'
+            },
+            archive_dir=os.path.join(archive_dir, 'campaigns'),
+            ttl=self.config.get('finished_run_ttl', 3600),
+            max_finished=self.config.get('max_finished_runs', 50),
+            on_evict=self._forget_campaign
+        )
+        self.active_searches = CampaignRegistry(
+            default_factory=lambda: {
+                "status": "idle",          # idle | running | completed | failed
+                "keywords": "",
+                "max_invites": 0,
+                "invites_sent": 0,
+                "progress": 0,
+                "stop_requested": False,
+                "start_time": None,
+                "end_time": None,
+                "driver_errors": 0
+            },
+            archive_dir=os.path.join(archive_dir, 'searches'),
+            ttl=self.config.get('finished_run_ttl', 3600),
+            max_finished=self.config.get('max_finished_runs', 50)
+        )
+        # Per-campaign condition used to wake the campaign thread on operator actions / stop
+        self.campaign_conditions = {}
+        self.campaign_conditions_lock = threading.Lock()
+        # Serializes /resume_campaign's "is it running?" check with claiming the campaign
+        self.campaign_resume_lock = threading.Lock()
+        # Dashboard callbacks go through one keep-alive session on a background thread
+        self.reporter = DashboardReporter(lambda: self.config.get('dashboard_url'))
+        self.progress_encoders = {}
+        # Generated notes are reused when the same rendered prompt comes up again
+        self.message_cache = get_message_cache(
+            ttl=self.config.get('message_cache_ttl', 30 * 24 * 3600),
+            max_entries=self.config.get('message_cache_max_entries', 5000)
+        )
+        # One warm, logged-in Chrome session leased to campaigns, searches and inbox runs in turn
+        self.browser_pool = BrowserPool(
+            max_jobs=self.config.get('browser_max_jobs', 25),
+            max_memory_mb=self.config.get('browser_max_memory_mb', 1500)
+        )
+        # Append-only progress log used by /resume_campaign after a crash
+        self.journal = CampaignJournal(self.config.get('campaign_journal_dir', 'campaign_journal'))
         self.flask_app = None
         self.flask_thread = None
         self.running = False
-        self.active_searches = defaultdict(lambda: {
-    "status": "idle",          # idle | running | completed | failed
-    "keywords": "",
-    "max_invites": 0,
-    "invites_sent": 0,
-    "progress": 0,
-    "stop_requested": False,
-    "start_time": None,
-    "end_time": None,
-    "driver_errors": 0
-})
-        # Initialize Gemini AI
-        try:
-            gemini_api_key = self.config.get('gemini_api_key')
-            if not gemini_api_key:
-                logger.error("❌ No Gemini API key found in configuration")
-                self.model = None
-            else:
-                genai.configure(api_key=gemini_api_key)
-                self.model = genai.GenerativeModel('gemini-1.5-flash')
-                logger.info("✅ Gemini AI initialized successfully")
-        except Exception as e:
-            logger.error(f"❌ Gemini AI initialization failed: {e}")
-            self.model = None
+        # Initialize Gemini AI (shared with every campaign / inbox run on the same key)
+        gemini_api_key = self.config.get('gemini_api_key')
+        if not gemini_api_key:
+            logger.error("❌ No Gemini API key found in configuration")
+        self.model = self.get_model(gemini_api_key)
+        if self.model:
+            threading.Thread(
+                target=warm_up_model,
+                args=(gemini_api_key,),
+                kwargs={'requests_per_minute': self.config.get('gemini_requests_per_minute', 15)},
+                name="gemini-warmup",
+                daemon=True
+            ).start()
 
         # Setup ngrok tunnel and register with dashboard
         # try:
@@ -143,6 +189,8 @@ class EnhancedLinkedInAutomationClient:
 
     def create_config_gui(self):
         """Create configuration GUI with dashboard URL options"""
+        import requests
+
         sg.theme('DarkBlue3')
         
         # Default values
@@ -172,6 +220,8 @@ class EnhancedLinkedInAutomationClient:
         ]
 
         window = sg.Window('LinkedIn Automation Client Setup', layout, finalize=True)
+        startup_profile.mark('config window shown')
+        startup_profile.report()
         
         # Initialize with online dashboard selected
         window['use_online'].update(True)
@@ -295,6 +345,8 @@ class EnhancedLinkedInAutomationClient:
 
     def setup_flask_app(self):
         """Setup Flask app for receiving requests from dashboard"""
+        from flask import Flask, Response, request, jsonify
+
         self.flask_app = Flask(__name__)
 
         @self.flask_app.route('/health', methods=['GET'])
@@ -304,9 +356,18 @@ class EnhancedLinkedInAutomationClient:
                 'timestamp': datetime.now().isoformat(),
                 'active_campaigns': len(self.active_campaigns),
                 'version': '2.0.0',
-                'dashboard_url': self.config.get('dashboard_url', 'unknown')
+                'dashboard_url': self.config.get('dashboard_url', 'unknown'),
+                'gemini': model_health(),
+                'browser': self.browser_pool.status(),
+                'page_waits': wait_stats(),
+                'spans': get_recorder().summary()
             })
 
+        @self.flask_app.route('/metrics', methods=['GET'])
+        def metrics():
+            """Span histograms in Prometheus text format"""
+            return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
         @self.flask_app.route('/start_campaign', methods=['POST'])
         def start_campaign():
             try:
@@ -314,12 +375,20 @@ class EnhancedLinkedInAutomationClient:
                 campaign_id = data.get('campaign_id', str(uuid.uuid4()))
                 user_config = data.get('user_config', {})
                 campaign_data = data.get('campaign_data', {})
+                if campaign_data.get('contacts_file'):
+                    try:
+                        resolve_upload(campaign_data['contacts_file'])
+                    except ValueError as e:
+                        return jsonify({'success': False, 'error': str(e)}), 400
                 
                 logger.info(f"🚀 Starting campaign: {campaign_id}")
                 
                 # Start campaign in background thread
                 campaign_thread = threading.Thread(
-                    target=self.run_enhanced_outreach_campaign,
+                    target=self._with_log_context(
+                        self._hold_run(self.active_campaigns, campaign_id, self.run_enhanced_outreach_campaign),
+                        campaign_id=campaign_id
+                    ),
                     args=(campaign_id, user_config, campaign_data),
                     daemon=True
                 )
@@ -335,6 +404,88 @@ class EnhancedLinkedInAutomationClient:
                 logger.error(f"❌ Error starting campaign: {e}")
                 return jsonify({'success': False, 'error': str(e)}), 500
 
+        @self.flask_app.route('/resume_campaign/<campaign_id>', methods=['POST'])
+        def resume_campaign(campaign_id):
+            """Restart an interrupted campaign from its last journaled checkpoint"""
+            claimed = False
+            try:
+                data = request.get_json(silent=True) or {}
+
+                # Check and claim in one step, so concurrent resumes can't both start a worker
+                with self.campaign_resume_lock:
+                    current = self.active_campaigns.get(campaign_id)
+                    if self.active_campaigns.is_held(campaign_id) or (
+                            current and current.get('status') not in TERMINAL_STATUSES):
+                        return jsonify({'success': False, 'error': 'Campaign is still running'}), 409
+
+                    checkpoint = self.journal.load(campaign_id)
+                    if checkpoint is None:
+                        return jsonify({'success': False, 'error': 'No checkpoint found for campaign'}), 404
+                    if checkpoint['finished']:
+                        return jsonify({'success': False, 'error': 'Campaign already completed'}), 409
+                    contacts_file = checkpoint['campaign_data'].get('contacts_file')
+                    if contacts_file:
+                        try:
+                            contacts_path = resolve_upload(contacts_file)
+                        except ValueError as e:
+                            return jsonify({'success': False, 'error': str(e)}), 400
+                        if not os.path.exists(contacts_path):
+                            return jsonify({'success': False, 'error': 'Contacts upload no longer available'}), 410
+
+                    self.active_campaigns[campaign_id] = {'status': 'resuming', 'stop_requested': False}
+                    run = self._hold_run(self.active_campaigns, campaign_id, self.run_enhanced_outreach_campaign)
+                    claimed = True
+
+                user_config = dict(checkpoint['user_config'], **data.get('user_config', {}))
+
+                logger.info(
+                    f"🔄 Resuming campaign {campaign_id} from row {checkpoint['resume_row']} "
+                    f"({len(checkpoint['done_urls'])} contacts already handled)"
+                )
+                campaign_thread = threading.Thread(
+                    target=self._with_log_context(run, campaign_id=campaign_id),
+                    args=(campaign_id, user_config, checkpoint['campaign_data']),
+                    kwargs={'checkpoint': checkpoint},
+                    daemon=True
+                )
+                campaign_thread.start()
+                claimed = False  # the worker releases it from here on
+
+                return jsonify({
+                    'success': True,
+                    'campaign_id': campaign_id,
+                    'resume_row': checkpoint['resume_row'],
+                    'contacts_done': len(checkpoint['done_urls'])
+                })
+
+            except Exception as e:
+                logger.error(f"❌ Error resuming campaign: {e}")
+                if claimed:
+                    # No worker took over, so free the campaign for another resume
+                    self.active_campaigns[campaign_id]['status'] = 'failed'
+                    self.active_campaigns.release(campaign_id)
+                return jsonify({'success': False, 'error': str(e)}), 500
+
+        @self.flask_app.route('/upload_contacts', methods=['POST'])
+        def upload_contacts():
+            """
+            Stream a large contact list (NDJSON or CSV body, chunked uploads
+            welcome) to disk. Pass the returned upload ID as `contacts_file`
+            in campaign_data instead of an inline `contacts` list; the upload
+            is deleted once that campaign ends.
+            """
+            try:
+                upload_id = spool_upload(
+                    request.stream, request.content_type,
+                    max_bytes=self.config.get('max_upload_bytes', MAX_UPLOAD_BYTES)
+                )
+                return jsonify({'success': True, 'contacts_file': upload_id})
+            except ValueError as e:
+                return jsonify({'success': False, 'error': str(e)}), 413
+            except Exception as e:
+                logger.error(f"❌ Error receiving contacts upload: {e}")
+                return jsonify({'success': False, 'error': str(e)}), 500
+
         @self.flask_app.route('/keyword_search', methods=['POST'])
         def keyword_search():
             try:
@@ -347,7 +498,7 @@ class EnhancedLinkedInAutomationClient:
                 
                 # Start search in background thread
                 search_thread = threading.Thread(
-                    target=self.run_enhanced_keyword_search,
+                    target=self._with_log_context(self.run_enhanced_keyword_search, search_id=search_id),
                     args=(search_id, user_config, search_params),
                     daemon=True
                 )
@@ -377,7 +528,10 @@ class EnhancedLinkedInAutomationClient:
                 logger.info(f"🚀 Search-and-connect started: {task_id}")
 
                 th = threading.Thread(
-                    target=self.run_search_connect_campaign,
+                    target=self._with_log_context(
+                        self._hold_run(self.active_searches, task_id, self.run_search_connect_campaign),
+                        search_id=task_id
+                    ),
                     args=(task_id, user_config, params),
                     daemon=True
                 )
@@ -401,7 +555,7 @@ class EnhancedLinkedInAutomationClient:
                 
                 # Start inbox processing in background thread
                 inbox_thread = threading.Thread(
-                    target=self.run_enhanced_inbox_processing,
+                    target=self._with_log_context(self.run_enhanced_inbox_processing, process_id=process_id),
                     args=(process_id, user_config),
                     daemon=True
                 )
@@ -419,7 +573,9 @@ class EnhancedLinkedInAutomationClient:
 
         @self.flask_app.route('/campaign_status/<campaign_id>', methods=['GET'])
         def get_campaign_status(campaign_id):
-            status = self.active_campaigns.get(campaign_id, {})
+            status = self.active_campaigns.get(campaign_id)
+            if status is None:
+                status = self.active_campaigns.get_archived(campaign_id) or {}
             # Don't send the full user_action object back, just the status
             status_copy = status.copy()
             status_copy.pop('user_action', None)
@@ -435,15 +591,18 @@ class EnhancedLinkedInAutomationClient:
                 contact_index = data.get('contact_index')
                 
                 if campaign_id in self.active_campaigns:
-                    self.active_campaigns[campaign_id]['user_action'] = {
-                        'action': action,
-                        'message': message,
-                        'contact_index': contact_index,
-                        'timestamp': datetime.now().isoformat()
-                    }
-                    
-                    # Resume campaign processing
-                    self.active_campaigns[campaign_id]['awaiting_confirmation'] = False
+                    condition = self._campaign_condition(campaign_id)
+                    with condition:
+                        self.active_campaigns[campaign_id]['user_action'] = {
+                            'action': action,
+                            'message': message,
+                            'contact_index': contact_index,
+                            'timestamp': datetime.now().isoformat()
+                        }
+                        
+                        # Resume campaign processing
+                        self.active_campaigns[campaign_id]['awaiting_confirmation'] = False
+                        condition.notify_all()
                     
                     logger.info(f"✅ Received action '{action}' for campaign {campaign_id}")
                     return jsonify({'success': True})
@@ -457,94 +616,71 @@ class EnhancedLinkedInAutomationClient:
         @self.flask_app.route('/stop_campaign/<campaign_id>', methods=['POST'])
         def stop_campaign(campaign_id):
             if campaign_id in self.active_campaigns:
-                self.active_campaigns[campaign_id]['stop_requested'] = True
+                condition = self._campaign_condition(campaign_id)
+                with condition:
+                    self.active_campaigns[campaign_id]['stop_requested'] = True
+                    condition.notify_all()
                 return jsonify({'success': True, 'message': 'Stop request sent'})
             return jsonify({'success': False, 'error': 'Campaign not found'}), 404
 
     # ... (rest of the methods remain the same) ...
 
-    def report_progress_to_dashboard(self, campaign_id, final=False):
-        """Report campaign progress back to dashboard with better error handling"""
-        try:
-            dashboard_url = self.config.get('dashboard_url')
-            if not dashboard_url:
-                logger.debug("No dashboard URL configured")
-                return
+    def _with_log_context(self, target, **fields):
+        """Wrap a job's thread target so its log records carry these IDs plus a fresh correlation_id"""
+        fields.setdefault('correlation_id', uuid.uuid4().hex[:12])
 
-            progress_data = self.active_campaigns.get(campaign_id, {})
-            
-            # Include current contact info if awaiting confirmation
-            if progress_data.get('awaiting_confirmation') and progress_data.get('current_contact'):
-                progress_data['awaiting_action'] = True
-                progress_data['current_contact_preview'] = progress_data['current_contact']
-            
-            endpoint = f"{dashboard_url}/api/campaign_progress"
-            
-            response = requests.post(endpoint, json={
-                'campaign_id': campaign_id,
-                'progress': progress_data,
-                'final': final
-            }, timeout=30, verify=True)  # Increased timeout and enable SSL verification
-            
-            if response.status_code == 200:
-                logger.debug(f"✅ Successfully reported progress for campaign {campaign_id}")
-            else:
-                logger.warning(f"⚠️ Dashboard progress report returned status {response.status_code}")
+        def run(*args, **kwargs):
+            with log_context(**fields):
+                return target(*args, **kwargs)
+        return run
 
-        except requests.exceptions.Timeout:
-            logger.warning(f"⚠️ Timeout reporting progress to dashboard for campaign {campaign_id}")
-        except requests.exceptions.ConnectionError:
-            logger.warning(f"⚠️ Connection error reporting progress to dashboard for campaign {campaign_id}")
-        except Exception as e:
-            logger.debug(f"Could not report progress for campaign {campaign_id}: {e}")
+    def _hold_run(self, registry, key, target):
+        """Pin `key` in `registry` now and unpin it once the returned thread target finishes"""
+        registry.hold(key)
 
-    def report_search_results_to_dashboard(self, search_id, results):
-        """Report search results back to dashboard with better error handling"""
-        try:
-            dashboard_url = self.config.get('dashboard_url')
-            if not dashboard_url:
-                return
-
-            endpoint = f"{dashboard_url}/api/search_results"
-            
-            response = requests.post(endpoint, json={
-                'search_id': search_id,
-                'results': results
-            }, timeout=30, verify=True)
-            
-            if response.status_code == 200:
-                logger.info(f"✅ Successfully reported search results for {search_id}")
-            else:
-                logger.warning(f"⚠️ Dashboard search report returned status {response.status_code}")
-
-        except Exception as e:
-            logger.debug(f"Could not report search results for {search_id}: {e}")
+        def run(*args, **kwargs):
+            try:
+                return target(*args, **kwargs)
+            finally:
+                registry.release(key)
+        return run
+
+    def get_model(self, api_key=None):
+        """Shared Gemini model for `api_key` (defaults to the configured key)"""
+        return get_gemini_model(
+            api_key or self.config.get('gemini_api_key'),
+            requests_per_minute=self.config.get('gemini_requests_per_minute', 15)
+        )
 
-    def report_inbox_results_to_dashboard(self, process_id, results):
-        """Report inbox processing results back to dashboard with better error handling"""
-        try:
-            dashboard_url = self.config.get('dashboard_url')
-            if not dashboard_url:
-                return
+    def lease_browser(self, user_config):
+        """Lease the pooled LinkedIn session for this job's account (None if login failed)"""
+        return self.browser_pool.acquire(
+            email=user_config.get('linkedin_email', self.config['linkedin_email']),
+            password=user_config.get('linkedin_password', self.config['linkedin_password']),
+            api_key=user_config.get('gemini_api_key', self.config['gemini_api_key']),
+            model=self.get_model(user_config.get('gemini_api_key'))
+        )
 
-            endpoint = f"{dashboard_url}/api/inbox_results"
-            
-            response = requests.post(endpoint, json={
-                'process_id': process_id,
-                'results': results
-            }, timeout=30, verify=True)
-            
-            if response.status_code == 200:
-                logger.info(f"✅ Successfully reported inbox results for {process_id}")
-            else:
-                logger.warning(f"⚠️ Dashboard inbox report returned status {response.status_code}")
+    def _forget_campaign(self, campaign_id):
+        """Drop per-campaign helpers once the registry evicts a finished campaign"""
+        with self.campaign_conditions_lock:
+            self.campaign_conditions.pop(campaign_id, None)
+        self.progress_encoders.pop(campaign_id, None)
+
+    def _campaign_condition(self, campaign_id):
+        """Return the condition the campaign thread waits on for operator decisions"""
+        with self.campaign_conditions_lock:
+            condition = self.campaign_conditions.get(campaign_id)
+            if condition is None:
+                condition = threading.Condition()
+                self.campaign_conditions[campaign_id] = condition
+            return condition
 
-        except Exception as e:
-            logger.debug(f"Could not report inbox results for {process_id}: {e}")
     # ==============================================
     # ENHANCED LINKEDIN AUTOMATION FUNCTIONS
     # ==============================================
 
+    @traced('driver_startup')
     def initialize_browser(self):
         """Initialize Chrome browser with optimal settings"""
         from selenium import webdriver
@@ -575,6 +711,7 @@ class EnhancedLinkedInAutomationClient:
             element.send_keys(char)
             time.sleep(random.uniform(0.05, 0.2))
 
+    @traced('login', ok=bool)
     def login(self):
         """Enhanced login with session validation and persistence - ORIGINAL APPROACH"""
         try:
@@ -582,7 +719,7 @@ class EnhancedLinkedInAutomationClient:
             
             # First, navigate to LinkedIn feed to check existing session
             self.driver.get("https://www.linkedin.com/feed")
-            time.sleep(3)
+            wait_until_ready(self.driver, 'feed')
             
             # Check if already logged in by looking for navigation elements
             if self._is_logged_in():
@@ -680,82 +817,18 @@ class EnhancedLinkedInAutomationClient:
             return False
 
 
+    @traced('extract_profile_data')
     def extract_profile_data(self, driver):
         """Extract profile data from LinkedIn profile page"""
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.common.exceptions import NoSuchElementException, TimeoutException
-        
-        profile_data = {}
         try:
-            WebDriverWait(driver, 10).until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "h1")),
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".pv-text-details__left-panel"))
-                )
-            )
+            wait_until_ready(driver, 'profile', timeout=10)
 
-            # Extract name
-            name_selectors = [
-                "h1.text-heading-xlarge",
-                ".pv-text-details__left-panel h1",
-                "[data-test-id='profile-name'] h1",
-                ".ph5 h1"
-            ]
-            
-            for selector in name_selectors:
-                try:
-                    name_elem = driver.find_element(By.CSS_SELECTOR, selector)
-                    profile_data['extracted_name'] = name_elem.text.strip()
-                    logger.info(f"📝 Extracted name: {profile_data['extracted_name']}")
-                    break
-                except NoSuchElementException:
-                    continue
-
-            # Extract headline
-            headline_selectors = [
-                ".text-body-medium.break-words",
-                ".pv-text-details__left-panel .text-body-medium",
-                "[data-test-id='profile-headline']"
-            ]
-            
-            for selector in headline_selectors:
-                try:
-                    headline_elem = driver.find_element(By.CSS_SELECTOR, selector)
-                    headline_text = headline_elem.text.strip()
-                    if headline_text and headline_text != profile_data.get('extracted_name', ''):
-                        profile_data['extracted_headline'] = headline_text
-                        logger.info(f"💼 Extracted headline: {headline_text[:50]}...")
-                        break
-                except NoSuchElementException:
-                    continue
-
-            # Extract about section
-            about_selectors = [
-                "[data-test-id='about-section'] .pv-shared-text-with-see-more span[aria-hidden='true']",
-                ".pv-about-section .pv-shared-text-with-see-more span"
-            ]
-            
-            for selector in about_selectors:
-                try:
-                    about_elem = driver.find_element(By.CSS_SELECTOR, selector)
-                    about_text = about_elem.text.strip()
-                    if about_text:
-                        profile_data['about_snippet'] = about_text[:150] + "..." if len(about_text) > 150 else about_text
-                        logger.info(f"📄 Extracted about: {profile_data['about_snippet'][:50]}...")
-                        break
-                except NoSuchElementException:
-                    continue
-
-            # Set defaults
-            if not profile_data.get('extracted_name'):
-                profile_data['extracted_name'] = "Professional"
-            if not profile_data.get('about_snippet'):
-                profile_data['about_snippet'] = ""
+            # Name, headline and about in a single script round trip
+            profile_data = extract_profile(driver)
 
         except Exception as e:
             logger.warning(f"⚠️ Profile data extraction failed: {e}")
+            set_status('failed')
             profile_data = {
                 'extracted_name': 'Professional',
                 'extracted_headline': '',
@@ -764,6 +837,7 @@ class EnhancedLinkedInAutomationClient:
 
         return profile_data
 
+    @traced('generate_message')
     def generate_message(self, name, company, role, service_1, service_2, profile_data=None):
         """Generate personalized message using AI"""
         if not self.model:
@@ -800,26 +874,26 @@ Return ONLY the message text, no labels or formatting.
             about_snippet=about_snippet
         )
 
-        for attempt in range(3):
-            try:
-                response = self.model.generate_content(prompt)
-                message = response.text.strip()
-                message = re.sub(r'^(Icebreaker:|Message:)\s*', '', message, flags=re.IGNORECASE)
-                message = message.strip('"\'[]')
-                
-                if len(message) > 280:
-                    message = message[:277] + "..."
-                
-                return message
-                
-            except Exception as e:
-                if "429" in str(e) or "ResourceExhausted" in str(e):
-                    wait_time = 30 * (attempt + 1)
-                    logger.warning(f"⏳ Gemini rate limit hit. Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"❌ Gemini error: {e}")
-                    break
+        cached = self.message_cache.get(prompt, NOTE_PROMPT_VERSION)
+        if cached:
+            logger.info(f"♻️ Using cached message for {actual_name}")
+            return cached
+
+        try:
+            response = self.model.generate_content(prompt)
+            message = response.text.strip()
+            message = re.sub(r'^(Icebreaker:|Message:)\s*', '', message, flags=re.IGNORECASE)
+            message = message.strip('"\'[]')
+            
+            if len(message) > 280:
+                message = message[:277] + "..."
+            
+            self.message_cache.put(prompt, message, NOTE_PROMPT_VERSION)
+            return message
+            
+        except Exception as e:
+            logger.error(f"❌ Gemini error: {e}")
+            set_status('failed')
 
         # Fallback message
         fallback_msg = f"Hi {actual_name}, I'm impressed by your {role} work at {company}. I'd love to connect and exchange insights. Looking forward to connecting!"
@@ -847,26 +921,8 @@ Return ONLY the message text, no labels or formatting.
             return False
 
     def find_element_safe(self, driver, selectors, timeout=10):
-        """Find element using multiple selectors"""
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.common.exceptions import TimeoutException
-        
-        for selector_type, selector in selectors:
-            try:
-                if selector_type == "xpath":
-                    element = WebDriverWait(driver, timeout).until(
-                        EC.presence_of_element_located((By.XPATH, selector))
-                    )
-                else:
-                    element = WebDriverWait(driver, timeout).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                return element
-            except TimeoutException:
-                continue
-        return None
+        """Find element using multiple selectors (raced in one wait, in priority order)"""
+        return find_first(driver, selectors, timeout=timeout, clickable=False)
 
     def send_connection_request_with_note(self, message, name):
         """Send connection request with personalized note"""
@@ -1214,37 +1270,47 @@ Return ONLY the message text, no labels or formatting.
         url = (f"https://www.linkedin.com/search/results/people/"
                f"?keywords={quote_plus(keywords)}&origin=GLOBAL_SEARCH_HEADER")
         
-        driver.get(url)
-        time.sleep(3)
+        with span('navigation', page='search_results'):
+            driver.get(url)
+            wait_until_ready(driver, 'search_results')
         
         sent_count = 0
         page_loops = 0
         total_attempts = 0
+        tracked_store = get_tracked_store()
         
         while sent_count < max_invites and page_loops < 10:
             logger.info(f"📊 Current status: {sent_count}/{max_invites} invitations sent")
             
-            # Find connect buttons
-            connect_buttons = self.find_connect_buttons_enhanced(driver)
+            # Read every result card (URL, name, button state) in one round trip
+            connect_cards = connectable(harvest_search_results(driver))
+            logger.info(f"Found {len(connect_cards)} available connect buttons")
             
-            if not connect_buttons:
+            if not connect_cards:
                 logger.info("No connect buttons found on this page")
                 if not self.go_to_next_page(driver):
                     break
                 page_loops += 1
                 continue
             
-            for btn in connect_buttons:
+            for card in connect_cards:
                 if sent_count >= max_invites:
                     logger.info(f"🎯 Target reached: {sent_count}/{max_invites} invitations sent")
                     return sent_count
                 
+                btn, profile_url = card['button'], card['profile_url']
+                if profile_url and tracked_store.contains(profile_url):
+                    logger.info(f"⏭️ Skipping {profile_url} - already messaged")
+                    continue
+                
                 total_attempts += 1
                 logger.info(f"🔄 Attempting connection #{total_attempts}")
                 
                 try:
                     if self.click_connect_and_validate(driver, btn):
                         sent_count += 1
+                        if profile_url:
+                            tracked_store.add(profile_url)
                         logger.info(f"✅ Success! Sent invitation #{sent_count}/{max_invites}")
                         time.sleep(random.uniform(2, 4))
                     else:
@@ -1263,29 +1329,31 @@ Return ONLY the message text, no labels or formatting.
         logger.info(f"🏁 Final results: {sent_count}/{max_invites} invitations sent ({total_attempts} total attempts)")
         return sent_count
 
+    def collect_search_profiles(self, driver, keywords, max_results=50, max_pages=3):
+        """Collect people-search results without connecting, one script round trip per page"""
+        logger.info(f"🔍 Collecting profiles for: {keywords}")
+        driver.get(f"https://www.linkedin.com/search/results/people/"
+                   f"?keywords={quote_plus(keywords)}&origin=GLOBAL_SEARCH_HEADER")
+        wait_until_ready(driver, 'search_results')
+
+        profiles = {}
+        for page in range(max_pages):
+            for card in harvest_search_results(driver):
+                key = card['profile_url'] or f"{page}:{card['handle']}"
+                if key not in profiles:
+                    profiles[key] = card_summary(card)
+            logger.info(f"📄 Page {page + 1}: {len(profiles)} profiles collected")
+            if len(profiles) >= max_results or not self.go_to_next_page(driver):
+                break
+            wait_until_ready(driver, 'search_results', timeout=10)
+
+        return list(profiles.values())[:max_results]
+
     def find_connect_buttons_enhanced(self, driver):
-        """Find connect buttons with enhanced detection"""
-        from selenium.webdriver.common.by import By
-        
-        selectors = [
-            "//button[contains(text(), 'Connect') and not(contains(@class, 'artdeco-button--disabled'))]",
-            "//button[.//span[text()='Connect'] and not(contains(@class, 'disabled'))]",
-            "//button[contains(@aria-label, 'Connect') and not(@disabled)]"
-        ]
-        
-        buttons = []
-        for selector in selectors:
-            try:
-                found_buttons = driver.find_elements(By.XPATH, selector)
-                for btn in found_buttons:
-                    if btn.is_displayed() and btn.is_enabled():
-                        buttons.append(btn)
-            except Exception as e:
-                logger.debug(f"Selector failed: {selector}, Error: {e}")
-        
-        unique_buttons = list(dict.fromkeys(buttons))
-        logger.info(f"Found {len(unique_buttons)} available connect buttons")
-        return unique_buttons
+        """Find connect buttons with enhanced detection (one script round trip per page)"""
+        buttons = [card['button'] for card in connectable(harvest_search_results(driver))]
+        logger.info(f"Found {len(buttons)} available connect buttons")
+        return buttons
 
     def click_connect_and_validate(self, driver, button):
         """Click connect button and validate success"""
@@ -1339,285 +1407,25 @@ Return ONLY the message text, no labels or formatting.
                 "//button[@aria-label='Next' and not(@disabled)] | //a[@aria-label='Next']"
             )))
             driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_button)
+            # Pagination is client-side: remember the current results so the wait can see them go
+            marker = next(iter(driver.find_elements(By.CSS_SELECTOR, SEARCH_RESULTS_MARKER)), None)
+            old_url = driver.current_url
             next_button.click()
-            return True
+            return wait_until_replaced(driver, 'search_results', marker, old_url, timeout=10)
         except TimeoutException:
             return False
         except Exception as e:
             return False
 
-    def navigate_to_messaging(self, driver):
-        """Navigate to LinkedIn messaging"""
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        
-        logger.info("Navigating to LinkedIn messaging...")
-        try:
-            driver.get("https://www.linkedin.com/messaging")
-            WebDriverWait(driver, 15).until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "ul.msg-conversations-container__conversations-list")),
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.msg-threads"))
-                )
-            )
-            logger.info("Successfully loaded messaging page.")
-            self.human_delay(2, 3)
-            return True
-        except:
-            logger.error("Failed to load messaging page in time.")
-            return False
-
-    def process_inbox_replies_enhanced(self, driver, max_replies=5):
-        """Process unread messages with improved reliability"""
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        
-        logger.info("🤖 Starting AI inbox processing...")
-        results = []
-        
-        if not self.navigate_to_messaging(driver):
-            return {"success": False, "error": "Messaging navigation failed"}
-        
-        try:
-            # Find unread conversations
-            unread_selector = (
-                "li.msg-conversations-container__conversation-list-item:has(.notification-badge--show), "
-                "li.conversation-list-item:has(.unread)"
-            )
-            
-            unread_items = WebDriverWait(driver, 10).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, unread_selector))
-            )
-            
-            logger.info(f"Found {len(unread_items)} unread conversations")
-            
-            for idx, item in enumerate(unread_items[:max_replies]):
-                try:
-                    # Extract participant name
-                    name_elem = item.find_element(
-                        By.CSS_SELECTOR,
-                        ".msg-conversation-listitem__participant-names, .conversation-list-item__participant-names"
-                    )
-                    name = name_elem.text.strip()
-                    
-                    logger.info(f"Processing conversation with {name} ({idx+1}/{len(unread_items)})")
-                    
-                    # Open conversation
-                    driver.execute_script("arguments[0].click();", item)
-                    self.human_delay(2, 3)
-                    
-                    # Wait for conversation to load
-                    WebDriverWait(driver, 10).until(
-                        EC.any_of(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "div.msg-s-message-list-content")),
-                            EC.presence_of_element_located((By.CSS_SELECTOR, "div.msg-thread"))
-                        )
-                    )
-                    
-                    # Get message history
-                    history = self.get_conversation_history(driver)
-                    if not history:
-                        logger.warning("No messages found, skipping")
-                        results.append({"name": name, "status": "skipped", "reason": "empty history"})
-                        self.navigate_to_messaging(driver)
-                        continue
-                    
-                    # Check if last message is from user
-                    if history and history[-1]["sender"] == "You":
-                        logger.info("Last message was from user, skipping")
-                        results.append({"name": name, "status": "skipped", "reason": "already replied"})
-                        self.navigate_to_messaging(driver)
-                        continue
-                    
-                    # Generate AI response
-                    ai_reply = self.generate_ai_chat_response(history)
-                    
-                    # Send response
-                    if self.send_chat_message(driver, ai_reply):
-                        logger.info(f"✅ Replied to {name}")
-                        results.append({"name": name, "status": "replied", "message": ai_reply})
-                    else:
-                        logger.error(f"❌ Failed to reply to {name}")
-                        results.append({"name": name, "status": "failed", "reason": "send error"})
-                    
-                    # Return to inbox
-                    self.navigate_to_messaging(driver)
-                    self.human_delay(2, 4)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing conversation: {e}")
-                    results.append({"name": f"Unknown{idx}", "status": "error", "reason": str(e)})
-                    try:
-                        self.navigate_to_messaging(driver)
-                    except:
-                        driver.refresh()
-            
-            return {"success": True, "results": results}
-            
-        except Exception as e:
-            logger.error(f"Inbox processing failed: {e}")
-            return {"success": False, "error": str(e)}
-
-    def get_conversation_history(self, driver):
-        """Extract conversation history"""
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        
-        logger.info("Extracting conversation history...")
-        conversation = []
-        
-        try:
-            # Wait for message container
-            self.wait.until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.msg-s-message-list-content")),
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.msg-thread"))
-                )
-            )
-            
-            # New UI extraction
-            if driver.find_elements(By.CSS_SELECTOR, "div.msg-s-message-list-content"):
-                message_elements = driver.find_elements(By.CSS_SELECTOR, "li.msg-s-message-list__event")
-                
-                for msg in message_elements:
-                    try:
-                        # Extract sender name
-                        try:
-                            sender = msg.find_element(By.CSS_SELECTOR, ".msg-s-message-group__name").text.strip()
-                        except:
-                            sender = "You"
-                        
-                        # Extract message text
-                        try:
-                            content = msg.find_element(By.CSS_SELECTOR, ".msg-s-event-listitem__body").text.strip()
-                        except:
-                            content = ""
-                        
-                        if content:
-                            conversation.append({"sender": sender, "message": content})
-                    except Exception as e:
-                        logger.debug(f"Skipping message: {e}")
-            
-            logger.info(f"Extracted {len(conversation)} messages")
-            return conversation
-            
-        except Exception as e:
-            logger.error(f"History extraction failed: {e}")
-            return []
-
-    def generate_ai_chat_response(self, conversation_history, user_persona="a helpful professional assistant"):
-        """Generate contextual response to a conversation using Gemini AI"""
-        if not self.model:
-            logger.error("AI model is not initialized. Cannot generate response.")
-            return "Sorry, I am unable to generate a response at this time."
-        
-        if not conversation_history:
-            logger.warning("Conversation history is empty. Cannot generate a contextual response.")
-            return "Could you please provide more context?"
-        
-        logger.info("Generating AI response for the chat...")
-        
-        # Format the conversation history for the AI prompt
-        formatted_history = "\n".join([f"{msg['sender']}: {msg['message']}" for msg in conversation_history])
-        
-        # Get the name of the other person
-        other_person_name = "there"
-        for msg in reversed(conversation_history):
-            if msg['sender'] != 'You':
-                other_person_name = msg['sender'].split()[0]  # Get first name
-                break
-        
-        prompt = f"""Craft a professional LinkedIn reply based on this conversation. Guidelines:
-
-1. Be concise (1-2 sentences max)
-2. Match the sender's tone (formal/casual)
-3. Address unread messages specifically
-4. Never use markdown or special formatting
-5. Respond naturally to questions
-6. Sign with just your first name
-
-Recent messages:
-{formatted_history}
-
-Response:"""
-        
-        try:
-            response = self.model.generate_content(prompt)
-            ai_message = response.text.strip()
-            
-            # Clean up any AI-added labels
-            ai_message = re.sub(r'^(Your Response:|Response:)\s*', '', ai_message, flags=re.IGNORECASE)
-            
-            logger.info(f"AI generated response: {ai_message}")
-            return ai_message
-            
-        except Exception as e:
-            logger.error(f"AI response generation failed: {e}")
-            return "I appreciate you reaching out. Let me review this and get back to you shortly."
-
-    def send_chat_message(self, driver, message):
-        """Types and sends a message in the currently active chat window"""
-        from selenium.webdriver.common.by import By
-        from selenium.webdriver.support.ui import WebDriverWait
-        from selenium.webdriver.support import expected_conditions as EC
-        from selenium.common.exceptions import TimeoutException, NoSuchElementException
-        
-        logger.info(f"Sending message: '{message[:50]}...'")
-        
-        try:
-            # Wait for message box to be ready
-            message_box_selector = "div.msg-form__contenteditable[role='textbox']"
-            message_box = WebDriverWait(driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, message_box_selector))
-            )
-            
-            # Wait for any previous messages to clear
-            self.human_delay(1, 2)
-            
-            # Clear any existing text
-            driver.execute_script("arguments[0].innerText = '';", message_box)
-            message_box.send_keys(" ")  # Trigger any required events
-            self.human_delay(0.5, 1)
-            
-            # Type message
-            self.type_like_human(message_box, message)
-            self.human_delay(1, 2)
-            
-            # Find and click the send button
-            send_button = driver.find_element(
-                By.CSS_SELECTOR,
-                "button.msg-form__send-button[type='submit'], button.msg-form-send-button"
-            )
-            
-            # Ensure button is enabled
-            if send_button.is_enabled():
-                self.safe_click(driver, send_button)
-                logger.info("Message sent successfully.")
-                self.human_delay(2, 4)
-                return True
-            else:
-                logger.error("Send button is disabled.")
-                return False
-                
-        except TimeoutException:
-            logger.error("Message input box not found or not interactable.")
-            return False
-        except NoSuchElementException:
-            logger.error("Send button not found.")
-            return False
-        except Exception as e:
-            logger.error(f"Failed to send message: {e}")
-            return False
-
     # ==============================================
     # ENHANCED CAMPAIGN RUNNERS
     # ==============================================
 
-    def run_enhanced_outreach_campaign(self, campaign_id, user_config, campaign_data):
+    def run_enhanced_outreach_campaign(self, campaign_id, user_config, campaign_data, checkpoint=None):
         """Run outreach campaign with PROPER message generation and user confirmation"""
+        automation = None
+        prefetcher = None
+        discard_browser = False
         try:
             # Initialize campaign status
             self.active_campaigns[campaign_id] = {
@@ -1633,75 +1441,108 @@ Response:"""
                 'current_contact': None,
                 'start_time': datetime.now().isoformat(),
                 'contacts_processed': [],
-                'user_action': None
+                'user_action': None,
+                'prefilter': {'total': 0, 'valid': 0, 'invalid': 0, 'duplicate': 0, 'already_messaged': 0}
             }
 
-            # Initialize LinkedIn automation
-            automation = LinkedInAutomation(
-                email=user_config.get('linkedin_email', self.config['linkedin_email']),
-                password=user_config.get('linkedin_password', self.config['linkedin_password']),
-                api_key=user_config.get('gemini_api_key', self.config['gemini_api_key'])
+            pending_draft = None
+            if checkpoint:
+                # Pick up the counters and results journaled before the restart
+                self.active_campaigns[campaign_id].update(checkpoint['state'])
+                self.active_campaigns[campaign_id]['contacts_processed'] = list(checkpoint['results'])
+                self.active_campaigns[campaign_id]['resumed_at'] = datetime.now().isoformat()
+                pending_draft = checkpoint['pending_draft']
+                self.journal.append(campaign_id, 'resume', from_row=checkpoint['resume_row'])
+            else:
+                self.journal.start(campaign_id, user_config, campaign_data)
+
+            # Pre-filter invalid / duplicate / already-messaged contacts before paying for Chrome + login
+            self.active_campaigns[campaign_id]['status'] = 'prefiltering'
+            contacts = self.iter_campaign_contacts(campaign_id, campaign_data, checkpoint)
+            first_contact = next(contacts, None)
+            prefilter = self.active_campaigns[campaign_id]['prefilter']
+            logger.info(
+                f"🧹 Pre-filter: {prefilter['valid']}/{prefilter['total']} valid, "
+                f"{prefilter['duplicate']} duplicates, {prefilter['already_messaged']} already messaged"
             )
 
-            # Login to LinkedIn - USE ORIGINAL PERSISTENT SESSION APPROACH
+            if first_contact is None:
+                logger.info(f"🏁 No new contacts to process for campaign {campaign_id} - skipping browser startup")
+                self.active_campaigns[campaign_id]['status'] = 'completed'
+                self.active_campaigns[campaign_id]['end_time'] = datetime.now().isoformat()
+                self.journal.checkpoint(campaign_id, self.active_campaigns[campaign_id], 'end', status='completed')
+                self.report_progress_to_dashboard(campaign_id, final=True)
+                return
+
+            contacts = chain([first_contact], contacts)
+
+            # Lease the shared logged-in browser (waits for any job already using it)
             self.active_campaigns[campaign_id]['status'] = 'logging_in'
-            if not automation.login():
+            automation = self.lease_browser(user_config)
+            if automation is None:
                 self.active_campaigns[campaign_id]['status'] = 'failed'
                 self.active_campaigns[campaign_id]['error'] = 'LinkedIn login failed'
-                automation.close()
+                self.journal.checkpoint(campaign_id, self.active_campaigns[campaign_id], 'end', status='failed')
                 return
 
             self.active_campaigns[campaign_id]['status'] = 'running'
 
-            # Load tracked profiles
-            tracked_profiles = set()
-            tracked_profiles_file = 'messaged_profiles.json'
-            if os.path.exists(tracked_profiles_file):
-                try:
-                    with open(tracked_profiles_file, 'r', encoding='utf-8') as f:
-                        tracked_profiles = set(json.load(f))
-                except:
-                    pass
-
             # Process contacts with MESSAGE GENERATION AND USER CONFIRMATION
-            contacts = campaign_data.get('contacts', [])[:campaign_data.get('max_contacts', 20)]
-            
-            for idx, contact in enumerate(contacts):
+            # Drafts for the next few contacts are prepared while the operator reviews the current one
+            prefetcher = DraftPrefetcher(
+                automation,
+                contacts,
+                lookahead=campaign_data.get('prefetch_lookahead', 2),
+                batch_size=campaign_data.get('draft_batch_size', 1)
+            )
+
+            for idx, contact, draft in prefetcher:
                 if self.active_campaigns[campaign_id]['stop_requested']:
                     self.active_campaigns[campaign_id]['status'] = 'stopped'
                     break
 
                 try:
                     linkedin_url = contact.get('LinkedIn_profile', '')
-                    if not linkedin_url or 'linkedin.com/in/' not in linkedin_url:
+                    if not canonical_profile_slug(linkedin_url):
                         self.active_campaigns[campaign_id]['failed'] += 1
+                        self._checkpoint_contact(campaign_id, idx, linkedin_url, 'failed')
                         continue
 
                     # Check if already messaged
-                    if linkedin_url in tracked_profiles:
+                    if automation.is_profile_messaged(linkedin_url):
                         logger.info(f"⏭️ Skipping {contact['Name']} - already messaged")
                         self.active_campaigns[campaign_id]['already_messaged'] += 1
                         self.active_campaigns[campaign_id]['progress'] += 1
+                        self._checkpoint_contact(campaign_id, idx, linkedin_url, 'already_messaged')
                         continue
 
                     # Navigate to profile
                     logger.info(f"🌐 Navigating to {contact['Name']}'s profile...")
-                    automation.driver.get(linkedin_url)
-                    time.sleep(3)
-
-                    # Extract profile data
-                    profile_data = automation.extract_profile_data()
-
-                    # 🚀 GENERATE PERSONALIZED MESSAGE FIRST
-                    logger.info(f"🤖 Generating personalized message for {contact['Name']}...")
-                    message = automation.generate_message(
-                        contact['Name'],
-                        contact['Company'],
-                        contact['Role'],
-                        contact.get('services and products_1', ''),
-                        contact.get('services and products_2', ''),
-                        profile_data
-                    )
+                    with prefetcher.driver_lock, span('navigation', page='profile'):
+                        automation.driver.get(linkedin_url)
+                        wait_until_ready(automation.driver, 'profile')
+
+                    # 🚀 PERSONALIZED MESSAGE (usually already drafted by the prefetcher)
+                    if pending_draft and pending_draft['row'] == idx:
+                        # The draft the operator was reviewing before the restart
+                        profile_data, message = pending_draft['profile_data'], pending_draft['message']
+                        draft.cancel()
+                    else:
+                        try:
+                            profile_data, message = draft.result()
+                        except Exception as e:
+                            logger.warning(f"⚠️ Prefetched draft failed for {contact['Name']}: {e}")
+                            with prefetcher.driver_lock:
+                                profile_data = automation.extract_profile_data()
+                            logger.info(f"🤖 Generating personalized message for {contact['Name']}...")
+                            message = automation.generate_message(
+                                contact['Name'],
+                                contact['Company'],
+                                contact['Role'],
+                                contact.get('services and products_1', ''),
+                                contact.get('services and products_2', ''),
+                                profile_data
+                            )
 
                     # 📝 SET UP USER CONFIRMATION
                     self.active_campaigns[campaign_id]['current_contact'] = {
@@ -1713,6 +1554,10 @@ Response:"""
 
                     self.active_campaigns[campaign_id]['awaiting_confirmation'] = True
                     self.active_campaigns[campaign_id]['status'] = 'awaiting_user_action'
+                    self.journal.append(
+                        campaign_id, 'draft',
+                        row=idx, contact=contact, message=message, profile_data=profile_data
+                    )
 
                     logger.info(f"⏳ Waiting for user confirmation for {contact['Name']}")
                     logger.info(f"💬 Generated message: {message}")
@@ -1720,15 +1565,16 @@ Response:"""
                     # Notify dashboard about the preview
                     self.report_progress_to_dashboard(campaign_id)
 
-                    # ⏰ WAIT FOR USER DECISION WITH TIMEOUT
-                    timeout_count = 0
+                    # ⏰ WAIT FOR USER DECISION WITH TIMEOUT (woken by /campaign_action or /stop_campaign)
                     max_timeout = 300  # 5 minutes
+                    condition = self._campaign_condition(campaign_id)
                     
-                    while (self.active_campaigns[campaign_id]['awaiting_confirmation'] and
-                        timeout_count < max_timeout and
-                        not self.active_campaigns[campaign_id]['stop_requested']):
-                        time.sleep(1)
-                        timeout_count += 1
+                    with condition, span('operator_wait'):
+                        decided = condition.wait_for(
+                            lambda: (not self.active_campaigns[campaign_id]['awaiting_confirmation'] or
+                                     self.active_campaigns[campaign_id]['stop_requested']),
+                            timeout=max_timeout
+                        )
 
                     # Check if user made a decision
                     user_action = self.active_campaigns[campaign_id].get('user_action')
@@ -1745,6 +1591,7 @@ Response:"""
                             self.active_campaigns[campaign_id]['awaiting_confirmation'] = False
                             self.active_campaigns[campaign_id]['current_contact'] = None
                             self.active_campaigns[campaign_id]['status'] = 'running'
+                            self._checkpoint_contact(campaign_id, idx, linkedin_url, 'skipped')
                             continue
 
                         elif action == 'send':
@@ -1752,10 +1599,11 @@ Response:"""
                             message = custom_message  # Use edited message if provided
 
                     # Check for timeout or stop
-                    if timeout_count >= max_timeout:
+                    if not decided:
                         logger.warning(f"⏰ Timeout waiting for user decision on {contact['Name']}")
                         self.active_campaigns[campaign_id]['skipped'] += 1
                         self.active_campaigns[campaign_id]['progress'] += 1
+                        self._checkpoint_contact(campaign_id, idx, linkedin_url, 'skipped')
                         continue
 
                     if self.active_campaigns[campaign_id]['stop_requested']:
@@ -1772,19 +1620,26 @@ Response:"""
                     
                     success = False
                     
-                    # PRIORITY 1: Try connection request with note
-                    logger.info("🎯 Priority 1: Attempting connection request with personalized note...")
-                    success = automation.send_connection_request_with_note(message, contact['Name'])
-                    
-                    if not success:
-                        # PRIORITY 2: Try connection request without note  
-                        logger.info("🎯 Priority 2: Attempting connection request without note...")
-                        success = automation.send_connection_request_without_note(contact['Name'])
-                    
-                    if not success:
-                        # PRIORITY 3: Try direct message
-                        logger.info("🎯 Priority 3: Attempting direct message...")
-                        success = automation.send_direct_message(message, contact['Name'])
+                    with prefetcher.driver_lock:
+                        # PRIORITY 1: Try connection request with note
+                        logger.info("🎯 Priority 1: Attempting connection request with personalized note...")
+                        with span('send_tier', tier='note') as labels:
+                            success = automation.send_connection_request_with_note(message, contact['Name'])
+                            labels['status'] = 'ok' if success else 'failed'
+                        
+                        if not success:
+                            # PRIORITY 2: Try connection request without note  
+                            logger.info("🎯 Priority 2: Attempting connection request without note...")
+                            with span('send_tier', tier='no_note') as labels:
+                                success = automation.send_connection_request_without_note(contact['Name'])
+                                labels['status'] = 'ok' if success else 'failed'
+                        
+                        if not success:
+                            # PRIORITY 3: Try direct message
+                            logger.info("🎯 Priority 3: Attempting direct message...")
+                            with span('send_tier', tier='direct_message') as labels:
+                                success = automation.send_direct_message(message, contact['Name'])
+                                labels['status'] = 'ok' if success else 'failed'
 
                     # Record results
                     contact_result = {
@@ -1800,20 +1655,18 @@ Response:"""
                     if success:
                         self.active_campaigns[campaign_id]['successful'] += 1
                         # Add to tracked profiles
-                        tracked_profiles.add(linkedin_url)
-                        try:
-                            with open(tracked_profiles_file, 'w', encoding='utf-8') as f:
-                                json.dump(list(tracked_profiles), f, ensure_ascii=False, indent=2)
-                        except:
-                            pass
+                        automation.add_profile_to_tracked(linkedin_url)
                         logger.info(f"✅ Successfully connected with {contact['Name']}")
-                        time.sleep(random.uniform(60, 120))  # Delay between successful connections
+                        time.sleep(random.uniform(*self.config.get('connection_delay_range', (60, 120))))  # Delay between successful connections
                     else:
                         self.active_campaigns[campaign_id]['failed'] += 1
                         logger.error(f"❌ Failed to connect with {contact['Name']}")
 
                     self.active_campaigns[campaign_id]['contacts_processed'].append(contact_result)
                     self.active_campaigns[campaign_id]['progress'] += 1
+                    self._checkpoint_contact(
+                        campaign_id, idx, linkedin_url, 'successful' if success else 'failed', contact_result
+                    )
 
                     # Report progress to dashboard
                     self.report_progress_to_dashboard(campaign_id)
@@ -1822,36 +1675,94 @@ Response:"""
                     logger.error(f"❌ Error processing {contact.get('Name', 'Unknown')}: {e}")
                     self.active_campaigns[campaign_id]['failed'] += 1
                     self.active_campaigns[campaign_id]['progress'] += 1
+                    self._checkpoint_contact(campaign_id, idx, contact.get('LinkedIn_profile', ''), 'failed')
 
             # Campaign completed
+            self.journal.checkpoint(
+                campaign_id, self.active_campaigns[campaign_id], 'end',
+                status='stopped' if self.active_campaigns[campaign_id]['stop_requested'] else 'completed'
+            )
             self.active_campaigns[campaign_id]['status'] = 'completed'
             self.active_campaigns[campaign_id]['end_time'] = datetime.now().isoformat()
 
             # Final progress report
+            automation.save_tracked_profiles()
             self.report_progress_to_dashboard(campaign_id, final=True)
-            automation.close()
 
         except Exception as e:
             logger.error(f"❌ Campaign {campaign_id} error: {e}")
+            discard_browser = True
             self.active_campaigns[campaign_id]['status'] = 'failed'
             self.active_campaigns[campaign_id]['error'] = str(e)
+            self.journal.checkpoint(campaign_id, self.active_campaigns[campaign_id], 'end', status='failed')
+
+        finally:
+            # The prefetch workers and their tab must be done with the driver before it changes hands
+            if prefetcher is not None:
+                prefetcher.close()
+            self.browser_pool.release(automation, discard=discard_browser)
+            campaign = self.active_campaigns.get(campaign_id) or {}
+            if campaign_data.get('contacts_file') and campaign.get('status') in TERMINAL_STATUSES:
+                discard_upload(campaign_data['contacts_file'])
+
+    def _checkpoint_contact(self, campaign_id, row, linkedin_url, outcome, result=None):
+        """Journal a finished contact together with the campaign counters"""
+        self.journal.checkpoint(
+            campaign_id, self.active_campaigns[campaign_id], 'contact',
+            row=row, profile=linkedin_url, outcome=outcome, result=result
+        )
 
+    def iter_campaign_contacts(self, campaign_id, campaign_data, checkpoint=None):
+        """
+        Stream (row, contact) pairs of validated, deduped contacts from
+        campaign_data['contacts'] or campaign_data['contacts_file'], skipping
+        what a resume checkpoint says was already handled
+        """
+        campaign = self.active_campaigns[campaign_id]
+        counted_rows = checkpoint['prefiltered_rows'] if checkpoint else set()
+
+        def on_counts(counts, start_row):
+            if start_row in counted_rows:
+                return  # already part of the restored counters
+            # Whole batches are screened, including rows past max_contacts, so these
+            # stay in 'prefilter' instead of the progress / failed counters
+            for key, value in counts.items():
+                campaign['prefilter'][key] = campaign['prefilter'].get(key, 0) + value
+            self.journal.checkpoint(campaign_id, campaign, 'prefilter', start_row=start_row, counts=counts)
+
+        limit = campaign_data.get('max_contacts', 20)
+        start_row, seen_urls = 0, ()
+        if checkpoint:
+            start_row, seen_urls = checkpoint['resume_row'], checkpoint['done_urls']
+            if limit:
+                limit -= len(seen_urls)
+                if limit <= 0:
+                    return iter(())
+
+        if campaign_data.get('contacts_file'):
+            source = iter_contact_file(resolve_upload(campaign_data['contacts_file']))
+        else:
+            source = campaign_data.get('contacts', [])
+
+        return iter_campaign_contacts(
+            source,
+            tracked_store=get_tracked_store(),
+            limit=limit,
+            on_counts=on_counts,
+            start_row=start_row,
+            seen_urls=seen_urls
+        )
 
     def run_enhanced_keyword_search(self, search_id, user_config, search_params):
-        """Run keyword-based LinkedIn search and connect with enhanced functionality"""
+        """Run keyword-based LinkedIn search and connect on the pooled browser session"""
+        automation = None
         try:
-            # Initialize browser
-            driver = self.initialize_browser()
-            
-            # Login
-            if not self.linkedin_login(
-                driver,
-                user_config.get('linkedin_email', self.config['linkedin_email']),
-                user_config.get('linkedin_password', self.config['linkedin_password'])
-            ):
+            # Lease the shared logged-in browser
+            automation = self.lease_browser(user_config)
+            if automation is None:
                 logger.error("❌ LinkedIn login failed for keyword search")
-                driver.quit()
                 return
+            driver = automation.driver
 
             # Perform search
             keywords = search_params.get('keywords', '')
@@ -1864,7 +1775,12 @@ Response:"""
                 results = self.search_and_connect(driver, keywords, max_invites)
             else:
                 # Just search for profiles without connecting
-                results = {'profiles_found': [], 'search_completed': True}
+                profiles = self.collect_search_profiles(
+                    driver, keywords,
+                    max_results=int(search_params.get('max_results', 50)),
+                    max_pages=int(search_params.get('max_pages', 3))
+                )
+                results = {'profiles_found': profiles, 'search_completed': True}
 
             # Report results to dashboard
             self.report_search_results_to_dashboard(search_id, {
@@ -1874,10 +1790,11 @@ Response:"""
                 'timestamp': datetime.now().isoformat()
             })
 
-            driver.quit()
+            self.browser_pool.release(automation)
 
         except Exception as e:
             logger.error(f"❌ Keyword search {search_id} error: {e}")
+            self.browser_pool.release(automation, discard=True)
         
     # ─── add to client_bot.py – right after run_enhanced_keyword_search() ─────────
     def run_search_connect_campaign(self, task_id: str, user_cfg: dict, params: dict) -> None:
@@ -1885,11 +1802,12 @@ Response:"""
         Full keyword *search & connect* flow with live progress reporting
         and graceful shutdown on user request.
         """
+        automation = None
         try:
             kw = params.get("keywords", "")
             max_invites = int(params.get("max_invites", 15))
 
-            self.active_searches[task_id].update({
+            self.active_searches.ensure(task_id).update({
                 "status": "initializing",
                 "keywords": kw,
                 "max_invites": max_invites,
@@ -1901,18 +1819,12 @@ Response:"""
             logger.info(f"🚀 Starting search-and-connect campaign: {task_id}")
             logger.info(f"🔍 Keywords: {kw}, Max invites: {max_invites}")
 
-            # Initialize LinkedIn automation instance (same as campaign flow)
-            automation = LinkedInAutomation(
-                email=user_cfg.get('linkedin_email', self.config['linkedin_email']),
-                password=user_cfg.get('linkedin_password', self.config['linkedin_password']),
-                api_key=user_cfg.get('gemini_api_key', self.config['gemini_api_key'])
-            )
-
-            # Login to LinkedIn
+            # Lease the shared logged-in browser (same as campaign flow)
             self.active_searches[task_id]["status"] = "logging_in"
             logger.info("🔐 Attempting LinkedIn login...")
+            automation = self.lease_browser(user_cfg)
             
-            if not automation.login():
+            if automation is None:
                 logger.error("❌ LinkedIn login failed")
                 self.active_searches[task_id]["status"] = "failed"
                 self.active_searches[task_id]["driver_errors"] += 1
@@ -1920,7 +1832,6 @@ Response:"""
                     "error": "login_failed",
                     "message": "LinkedIn login failed"
                 })
-                automation.close()
                 return
 
             logger.info("✅ LinkedIn login successful")
@@ -1951,12 +1862,12 @@ Response:"""
                 "message": f"Successfully sent {sent_count} connection requests"
             })
 
-            # Clean up
-            automation.close()
+            # Hand the browser back to the pool
+            self.browser_pool.release(automation)
 
         except Exception as exc:
             logger.error(f"❌ Search-connect task {task_id} failed: {exc}")
-            self.active_searches[task_id]["status"] = "failed"
+            self.active_searches.ensure(task_id)["status"] = "failed"
             self.active_searches[task_id]["end_time"] = datetime.now().isoformat()
             
             self.report_search_results_to_dashboard(task_id, {
@@ -1968,120 +1879,93 @@ Response:"""
             
             # Ensure cleanup
             try:
-                if 'automation' in locals():
-                    automation.close()
+                self.browser_pool.release(automation, discard=True)
             except Exception as cleanup_error:
                 logger.error(f"❌ Cleanup error: {cleanup_error}")
 
     def run_enhanced_inbox_processing(self, process_id, user_config):
-        """Process LinkedIn inbox with AI responses using enhanced functionality"""
+        """Process LinkedIn inbox with AI responses on the pooled browser session"""
+        automation = None
         try:
-            # Initialize browser
-            driver = self.initialize_browser()
-            
-            # Login
-            if not self.linkedin_login(
-                driver,
-                user_config.get('linkedin_email', self.config['linkedin_email']),
-                user_config.get('linkedin_password', self.config['linkedin_password'])
-            ):
+            # Lease the shared logged-in browser
+            automation = self.lease_browser(user_config)
+            if automation is None:
                 logger.error("❌ LinkedIn login failed for inbox processing")
-                driver.quit()
                 return
 
             # Process inbox
             logger.info("📬 Starting enhanced inbox processing")
-            results = self.process_inbox_replies_enhanced(driver)
+            results = automation.process_inbox_replies(
+                max_replies=user_config.get('max_replies', 5),
+                stream_replies=self.config.get('stream_inbox_replies', False)
+            )
 
             # Report results to dashboard
             self.report_inbox_results_to_dashboard(process_id, results)
 
-            driver.quit()
+            self.browser_pool.release(automation)
 
         except Exception as e:
             logger.error(f"❌ Inbox processing {process_id} error: {e}")
+            self.browser_pool.release(automation, discard=True)
 
     def report_progress_to_dashboard(self, campaign_id, final=False):
-        """Report campaign progress back to dashboard with better error handling"""
-        try:
-            dashboard_url = self.config.get('dashboard_url')
-            if not dashboard_url:
-                logger.debug("No dashboard URL configured")
-                return
+        """
+        Queue a campaign progress report for the dashboard.
 
-            progress_data = self.active_campaigns.get(campaign_id, {})
+        Intermediate reports are deltas against the last acknowledged one and
+        are coalesced over `progress_report_window` seconds; operator previews
+        and the final snapshot go out immediately.
+        """
+        encoder = self.progress_encoders.setdefault(campaign_id, ProgressDeltaEncoder())
+        if final:
+            self.progress_encoders.pop(campaign_id, None)
+
+        def build_payload():
+            progress_data = dict(self.active_campaigns.get(campaign_id, {}))
             
             # Include current contact info if awaiting confirmation
             if progress_data.get('awaiting_confirmation') and progress_data.get('current_contact'):
                 progress_data['awaiting_action'] = True
                 progress_data['current_contact_preview'] = progress_data['current_contact']
             
-            endpoint = f"{dashboard_url}/api/campaign_progress"
-            
-            response = requests.post(endpoint, json={
+            progress, token = encoder.build(progress_data, final=final)
+            return {
                 'campaign_id': campaign_id,
-                'progress': progress_data,
+                'progress': progress,
                 'final': final
-            }, timeout=30, verify=True)  # Increased timeout and enable SSL verification
-            
-            if response.status_code == 200:
-                logger.debug(f"✅ Successfully reported progress for campaign {campaign_id}")
-            else:
-                logger.warning(f"⚠️ Dashboard progress report returned status {response.status_code}")
-
-        except requests.exceptions.Timeout:
-            logger.warning(f"⚠️ Timeout reporting progress to dashboard for campaign {campaign_id}")
-        except requests.exceptions.ConnectionError:
-            logger.warning(f"⚠️ Connection error reporting progress to dashboard for campaign {campaign_id}")
-        except Exception as e:
-            logger.debug(f"Could not report progress for campaign {campaign_id}: {e}")
+            }, token
+
+        status = self.active_campaigns.get(campaign_id, {})
+        urgent = final or status.get('awaiting_confirmation')
+        self.reporter.post_coalesced(
+            ('campaign_progress', campaign_id),
+            '/api/campaign_progress',
+            build_payload,
+            on_sent=encoder.ack,
+            window=0 if urgent else self.config.get('progress_report_window', 2.0),
+            description=f"progress for campaign {campaign_id}"
+        )
 
     def report_search_results_to_dashboard(self, search_id, results):
-        """Report search results back to dashboard with better error handling"""
-        try:
-            dashboard_url = self.config.get('dashboard_url')
-            if not dashboard_url:
-                return
-
-            endpoint = f"{dashboard_url}/api/search_results"
-            
-            response = requests.post(endpoint, json={
-                'search_id': search_id,
-                'results': results
-            }, timeout=30, verify=True)
-            
-            if response.status_code == 200:
-                logger.info(f"✅ Successfully reported search results for {search_id}")
-            else:
-                logger.warning(f"⚠️ Dashboard search report returned status {response.status_code}")
-
-        except Exception as e:
-            logger.debug(f"Could not report search results for {search_id}: {e}")
+        """Queue search results for the dashboard"""
+        self.reporter.post('/api/search_results', {
+            'search_id': search_id,
+            'results': results
+        }, description=f"search results for {search_id}")
 
     def report_inbox_results_to_dashboard(self, process_id, results):
-        """Report inbox processing results back to dashboard with better error handling"""
-        try:
-            dashboard_url = self.config.get('dashboard_url')
-            if not dashboard_url:
-                return
-
-            endpoint = f"{dashboard_url}/api/inbox_results"
-            
-            response = requests.post(endpoint, json={
-                'process_id': process_id,
-                'results': results
-            }, timeout=30, verify=True)
-            
-            if response.status_code == 200:
-                logger.info(f"✅ Successfully reported inbox results for {process_id}")
-            else:
-                logger.warning(f"⚠️ Dashboard inbox report returned status {response.status_code}")
-
-        except Exception as e:
-            logger.debug(f"Could not report inbox results for {process_id}: {e}")
+        """Queue inbox processing results for the dashboard"""
+        self.reporter.post('/api/inbox_results', {
+            'process_id': process_id,
+            'results': results
+        }, description=f"inbox results for {process_id}")
 
     def start_client(self):
         """Start the client application in the correct order."""
+        import requests
+        from pyngrok import ngrok
+
         self.running = True
 
         # 1. Start Flask server in background thread
@@ -2184,6 +2068,8 @@ Response:"""
         ]
 
         window = sg.Window('LinkedIn Automation Client - Enhanced Status', layout, finalize=True)
+        startup_profile.mark('status window shown')
+        startup_profile.report()
 
         while self.running:
             event, values = window.read(timeout=3000)  # 3 second timeout
@@ -2203,6 +2089,9 @@ Response:"""
             window['searches'].update(search_text)
 
             if event == 'Refresh' or event == sg.TIMEOUT_EVENT:
+                self.active_campaigns.prune()
+                self.active_searches.prune()
+
                 # Update campaigns display
                 campaigns_text = ""
                 if self.active_campaigns:
@@ -2241,13 +2130,38 @@ Response:"""
             except:
                 pass
 
+        # Give queued dashboard reports a chance to go out
+        self.reporter.close(timeout=10)
+
+        # Shut down the warm browser session
+        self.browser_pool.close(timeout=10)
+
 def signal_handler(signum, frame):
     """Handle system signals for graceful shutdown"""
     logger.info("🛑 Received shutdown signal")
     sys.exit(0)
 
+def _logging_settings(config_file="client_config.json"):
+    """Optional log_* overrides from the client config (read before the client itself starts)"""
+    try:
+        with open(config_file, 'r') as f:
+            config = json.load(f)
+    except Exception:
+        config = {}
+    return {
+        'log_file': config.get('log_file', 'client_automation.jsonl'),
+        'level': logging.getLevelName(str(config.get('log_level', 'INFO')).upper()),
+        'console': config.get('log_console', True),
+        'max_bytes': config.get('log_max_bytes', 20 * 1024 * 1024),
+        'when': config.get('log_rotate_when', 'midnight'),
+        'backup_count': config.get('log_backup_count', 7)
+    }
+
 def main():
     """Main function"""
+    # Logging goes through a background queue (JSON lines file + console)
+    configure_logging(**_logging_settings())
+
     # Register signal handlers for graceful shutdown
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
@@ -0,0 +1,207 @@
+import os
+import re
+import csv
+import json
+import uuid
+import logging
+import tempfile
+from itertools import islice
+from urllib.parse import unquote
+
+from profile_store import ProfileHashIndex, profile_hash, url_key_hash
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_DIR = os.path.join(tempfile.gettempdir(), "linkedin_contact_uploads")
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_BYTES = 256 * 1024 * 1024
+PREFILTER_CHUNK_SIZE = 5000
+
+# Names spool_upload() gives its files; nothing else is ever read as an upload
+_UPLOAD_ID_PATTERN = re.compile(r'^contacts_[0-9a-f]{32}\.(?:csv|ndjson)$')
+
+# Same rule as profile_store.canonical_profile_slug(), in vectorizable form
+_PROFILE_SLUG_PATTERN = r'(?i)^(?:https?://)?(?:[^/?#@]*\.)?linkedin\.com(?::\d+)?/+in/+([^/?#]+)'
+
+
+def spool_upload(stream, content_type="", chunk_size=UPLOAD_CHUNK_SIZE, max_bytes=MAX_UPLOAD_BYTES):
+    """
+    Copy an uploaded contact list to disk chunk by chunk and return its
+    upload ID. Raises ValueError (and keeps nothing) past `max_bytes`.
+    """
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    extension = ".csv" if "csv" in (content_type or "").lower() else ".ndjson"
+    upload_id = f"contacts_{uuid.uuid4().hex}{extension}"
+    path = os.path.join(UPLOAD_DIR, upload_id)
+
+    size = 0
+    try:
+        with open(path, 'wb') as f:
+            while True:
+                chunk = stream.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise ValueError(f"Contacts upload exceeds {max_bytes} bytes")
+                f.write(chunk)
+    except Exception:
+        discard_upload(upload_id)
+        raise
+
+    logger.info(f"📥 Spooled {size} bytes of contacts as upload {upload_id}")
+    return upload_id
+
+
+def resolve_upload(upload_id):
+    """
+    Path of a spooled upload. Only IDs returned by spool_upload() are
+    accepted, so a campaign can't be pointed at any other file on the host.
+    """
+    reference = str(upload_id or "")
+    name = os.path.basename(reference)
+    path = os.path.join(UPLOAD_DIR, name)
+    # Full spool paths (what older clients were handed) still resolve, but only inside UPLOAD_DIR
+    inside_spool = name == reference or os.path.realpath(reference) == os.path.realpath(path)
+    if not inside_spool or not _UPLOAD_ID_PATTERN.match(name):
+        raise ValueError("contacts_file must be an upload ID returned by /upload_contacts")
+    return path
+
+
+def discard_upload(upload_id):
+    """Delete a spooled upload once nothing will read it again"""
+    try:
+        os.remove(resolve_upload(upload_id))
+        logger.info(f"🗑️ Removed contacts upload {os.path.basename(upload_id)}")
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        logger.warning(f"⚠️ Could not remove contacts upload {upload_id}: {e}")
+
+
+def iter_ndjson_contacts(path):
+    """Yield one contact dict per line of an NDJSON file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                contact = json.loads(line)
+            except ValueError as e:
+                logger.warning(f"⚠️ Skipping malformed contact on line {line_no}: {e}")
+                continue
+            if isinstance(contact, dict):
+                yield contact
+
+
+def iter_csv_contacts(path):
+    """Yield one contact dict per row of a CSV export"""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            yield row
+
+
+def iter_contact_file(path):
+    """Stream contacts from a CSV or NDJSON/JSONL file, picked by extension"""
+    if not path or not os.path.exists(path):
+        raise FileNotFoundError(f"Contacts file not found: {path}")
+    if path.lower().endswith(".csv"):
+        return iter_csv_contacts(path)
+    return iter_ndjson_contacts(path)
+
+
+def prefilter_contacts(contacts, tracked_index=None, seen_index=None, positions=False):
+    """
+    Vectorized validity / duplicate / already-messaged pass over a batch of contacts.
+
+    Returns (kept_contacts, counts). `tracked_index` and `seen_index` are
+    ProfileHashIndex instances; kept profiles are added to `seen_index` so
+    duplicates are also caught across successive batches. With
+    `positions=True` kept_contacts holds (batch_position, contact) pairs.
+    """
+    counts = {'total': len(contacts), 'valid': 0, 'invalid': 0, 'duplicate': 0, 'already_messaged': 0}
+    if not contacts:
+        return [], counts
+
+    # Only bulk ingest needs numpy / pandas, so they stay off the client's startup path
+    import numpy as np
+    import pandas as pd
+
+    urls = pd.Series(
+        [contact.get('LinkedIn_profile') if isinstance(contact, dict) else None for contact in contacts],
+        dtype=object
+    ).fillna('').astype(str).str.strip()
+
+    slugs = urls.str.extract(_PROFILE_SLUG_PATTERN, expand=False).fillna('')
+    encoded = slugs.str.contains('%', regex=False)
+    if encoded.any():
+        slugs[encoded] = slugs[encoded].map(unquote)
+    slugs = slugs.str.strip().str.lower()
+
+    valid = (slugs != '').to_numpy()
+    url_keys = 'https://www.linkedin.com/in/' + slugs
+    hashes = np.zeros(len(contacts), dtype=np.uint64)
+    hashes[valid] = np.fromiter(
+        (url_key_hash(key) for key in url_keys[valid]), dtype=np.uint64, count=int(valid.sum())
+    )
+
+    duplicate = valid & pd.Series(hashes).duplicated().to_numpy()
+    if seen_index is not None and len(seen_index):
+        duplicate |= valid & np.isin(hashes, seen_index.as_array())
+
+    already_messaged = np.zeros(len(contacts), dtype=bool)
+    if tracked_index is not None and len(tracked_index):
+        already_messaged = valid & ~duplicate & np.isin(hashes, tracked_index.as_array())
+
+    keep = valid & ~duplicate & ~already_messaged
+    counts['valid'] = int(valid.sum())
+    counts['invalid'] = int((~valid).sum())
+    counts['duplicate'] = int(duplicate.sum())
+    counts['already_messaged'] = int(already_messaged.sum())
+
+    kept = []
+    for i in np.flatnonzero(keep):
+        contact = contacts[i]
+        kept.append((int(i), contact) if positions else contact)
+        if seen_index is not None:
+            seen_index.add(int(hashes[i]))
+
+    return kept, counts
+
+
+def iter_campaign_contacts(contacts, tracked_store=None, limit=None, on_counts=None,
+                           chunk_size=PREFILTER_CHUNK_SIZE, start_row=0, seen_urls=()):
+    """
+    Lazily validate and dedupe a contact stream in prefiltered batches.
+
+    Contacts without a LinkedIn /in/ profile, repeats of a profile already
+    seen in this stream and profiles already in `tracked_store` are dropped.
+    Kept contacts keep the URL they were given; only the dedupe key is
+    canonical.
+    Yields (row, contact) pairs, `row` being the contact's position in the
+    source, for at most `limit` contacts. Each batch's counts are passed to
+    `on_counts(counts, batch_start_row)` before any of its contacts are
+    yielded.
+
+    To pick a stream back up, pass the batch-aligned `start_row` to begin
+    reading at and the profiles already handled as `seen_urls`.
+    """
+    tracked_index = tracked_store.hash_index() if tracked_store is not None else None
+    seen = ProfileHashIndex(value for value in map(profile_hash, seen_urls) if value)
+
+    def _filtered():
+        source = islice(iter(contacts), start_row, None)
+        row = start_row
+        while True:
+            chunk = list(islice(source, chunk_size))
+            if not chunk:
+                return
+            kept, counts = prefilter_contacts(chunk, tracked_index, seen, positions=True)
+            if on_counts:
+                on_counts(counts, row)
+            for position, contact in kept:
+                yield row + position, contact
+            row += len(chunk)
+
+    return islice(_filtered(), limit) if limit else _filtered()
@@ -0,0 +1,248 @@
+import json
+import time
+import queue
+import random
+import logging
+import threading
+from urllib.parse import urlparse
+
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+_COALESCED = object()
+_MISSING = object()
+
+
+class ProgressDeltaEncoder:
+    """
+    Builds campaign progress payloads relative to the last report the
+    dashboard acknowledged: only counters that changed and the
+    contacts_processed entries appended since then. Final reports carry the
+    full snapshot.
+    """
+
+    LIST_KEY = 'contacts_processed'
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acked_processed = 0
+        self.acked_fields = {}
+        self.sequence = 0
+
+    def build(self, state, final=False):
+        """Return (payload, ack_token) for the current campaign state"""
+        snapshot = dict(state)
+        processed = list(snapshot.pop(self.LIST_KEY, []))
+
+        with self._lock:
+            self.sequence += 1
+            if final:
+                payload = dict(snapshot, **{self.LIST_KEY: processed})
+                payload.update({'delta': False, 'sequence': self.sequence})
+            else:
+                payload = {k: v for k, v in snapshot.items() if self.acked_fields.get(k, _MISSING) != v}
+                payload.update({
+                    'delta': True,
+                    'sequence': self.sequence,
+                    'contacts_processed_offset': self.acked_processed,
+                    'contacts_processed_new': processed[self.acked_processed:]
+                })
+        return payload, (len(processed), snapshot)
+
+    def ack(self, token):
+        processed_count, fields = token
+        with self._lock:
+            self.acked_processed = max(self.acked_processed, processed_count)
+            self.acked_fields = fields
+
+
+class DashboardReporter:
+    """
+    Background sender for dashboard callbacks.
+
+    Plain reports are JSON-encoded on the caller's thread (so later mutation
+    of campaign state can't race the send) and queued; coalesced reports are
+    built by the worker when they are due. A single worker thread posts them
+    over one keep-alive session, retrying transient failures with jittered
+    exponential backoff.
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    COALESCED_RETRY_DELAY = 1.0  # seconds before a coalesced report retries a full queue
+
+    def __init__(self, get_dashboard_url, timeout=30, max_retries=4,
+                 backoff_base=1.0, backoff_max=30.0, max_queue=1000):
+        self.get_dashboard_url = get_dashboard_url
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({'Content-Type': 'application/json'})
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._coalesced = {}
+        self._coalesce_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="dashboard-reporter", daemon=True)
+        self._thread.start()
+
+    def post(self, path, payload, description="report"):
+        """Queue a JSON payload for POSTing to `path` on the dashboard; returns immediately"""
+        dashboard_url = self.get_dashboard_url()
+        if not dashboard_url:
+            logger.debug("No dashboard URL configured")
+            return False
+
+        body = json.dumps(payload, default=str, ensure_ascii=False).encode('utf-8')
+        try:
+            self._queue.put_nowait((f"{dashboard_url.rstrip('/')}{path}", body, description))
+            return True
+        except queue.Full:
+            logger.warning(f"⚠️ Dashboard report queue full, dropping {description}")
+            return False
+
+    def post_coalesced(self, key, path, build_payload, on_sent=None, window=2.0, description="report"):
+        """
+        Queue a report whose payload is built when it is sent.
+
+        Calls for the same `key` within `window` seconds collapse into a single
+        request. `build_payload()` returns (payload, token); `on_sent(token)`
+        runs once the dashboard has accepted it. A zero window sends right away.
+        """
+        if not self.get_dashboard_url():
+            logger.debug("No dashboard URL configured")
+            return False
+
+        with self._coalesce_lock:
+            already_scheduled = key in self._coalesced
+            self._coalesced[key] = {
+                'path': path,
+                'build': build_payload,
+                'on_sent': on_sent,
+                'description': description
+            }
+        if already_scheduled and window > 0:
+            return True
+
+        if window > 0:
+            self._schedule_coalesced(key, window)
+        else:
+            self._enqueue_coalesced(key)
+        return True
+
+    def _schedule_coalesced(self, key, delay):
+        timer = threading.Timer(delay, self._enqueue_coalesced, args=(key,))
+        timer.daemon = True
+        timer.start()
+
+    def _enqueue_coalesced(self, key):
+        try:
+            self._queue.put_nowait((_COALESCED, key))
+        except queue.Full:
+            # The key stays in _coalesced, so later posts won't schedule it; try again ourselves
+            if self._stopping.is_set():
+                return
+            logger.warning(f"⚠️ Dashboard report queue full, delaying coalesced report {key}")
+            self._schedule_coalesced(key, self.COALESCED_RETRY_DELAY)
+
+    def _send_coalesced(self, key):
+        with self._coalesce_lock:
+            entry = self._coalesced.pop(key, None)
+        dashboard_url = self.get_dashboard_url()
+        if not entry or not dashboard_url:
+            return
+
+        payload, token = entry['build']()
+        body = json.dumps(payload, default=str, ensure_ascii=False).encode('utf-8')
+        if self._send(f"{dashboard_url.rstrip('/')}{entry['path']}", body, entry['description']):
+            if entry['on_sent']:
+                entry['on_sent'](token)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                if item[0] is _COALESCED:
+                    self._send_coalesced(item[1])
+                else:
+                    self._send(*item)
+            except Exception as e:
+                logger.debug(f"Dashboard reporter error: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _send(self, endpoint, body, description):
+        with span('dashboard_report', endpoint=urlparse(endpoint).path) as labels:
+            sent = self._send_with_retries(endpoint, body, description)
+            labels['status'] = 'ok' if sent else 'failed'
+            return sent
+
+    def _send_with_retries(self, endpoint, body, description):
+        import requests
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                response = self.session.post(endpoint, data=body, timeout=self.timeout, verify=True)
+                if response.status_code == 200:
+                    logger.debug(f"✅ Successfully sent {description}")
+                    return True
+                if response.status_code not in self.RETRY_STATUSES:
+                    logger.warning(f"⚠️ Dashboard {description} returned status {response.status_code}")
+                    return False
+                retry_after = response.headers.get('Retry-After')
+                logger.debug(f"Dashboard {description} returned status {response.status_code}, retrying")
+            except requests.exceptions.Timeout:
+                logger.warning(f"⚠️ Timeout sending {description} to dashboard")
+            except requests.exceptions.ConnectionError:
+                logger.warning(f"⚠️ Connection error sending {description} to dashboard")
+            except Exception as e:
+                logger.debug(f"Could not send {description}: {e}")
+                return False
+
+            if attempt < self.max_retries:
+                delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+                delay = random.uniform(delay / 2, delay)
+                try:
+                    delay = max(delay, float(retry_after))
+                except (TypeError, ValueError):
+                    pass
+                if self._stopping.wait(delay):
+                    break
+
+        logger.warning(f"⚠️ Giving up on {description} after {attempt + 1} attempts")
+        return False
+
+    def flush(self, timeout=None):
+        """Block until every queued report has been handled (or `timeout` seconds pass)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout=10):
+        """Send what is queued (up to `timeout` seconds), then stop the worker"""
+        self.flush(timeout)
+        self._stopping.set()
+        try:
+            self._queue.put_nowait(_STOP)
+        except queue.Full:
+            pass
+        self._thread.join(timeout=1)
+        self.session.close()
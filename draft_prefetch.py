@@ -0,0 +1,149 @@
+import time
+import logging
+import threading
+import contextvars
+from collections import deque
+from itertools import islice
+from concurrent.futures import Future, InvalidStateError, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class DraftPrefetcher:
+    """
+    Bounded lookahead over a campaign's contacts.
+
+    While the operator reviews contact N, the profile data of the next
+    `lookahead` contacts is read in a second browser tab and their messages
+    are generated on a small worker pool. All driver access (ours and the
+    campaign thread's) is serialized through `driver_lock`; only the AI
+    calls run concurrently. With `batch_size` > 1, contacts are drafted in
+    groups that share a single AI request.
+
+    `contacts` yields (index, contact) pairs; iterating yields
+    (index, contact, future) where future.result() is (profile_data, message).
+    """
+
+    def __init__(self, automation, contacts, lookahead=2, batch_size=1):
+        self.automation = automation
+        self.lookahead = max(0, int(lookahead))
+        self.batch_size = max(1, int(batch_size))
+        self.driver_lock = threading.RLock()
+        self._contacts = iter(contacts)
+        self._queue = deque()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, self.lookahead),
+            thread_name_prefix="draft-prefetch"
+        )
+        self._main_handle = automation.driver.current_window_handle
+        self._prefetch_handle = None
+        self._closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        self._fill(1)
+        if not self._queue:
+            raise StopIteration
+        item = self._queue.popleft()
+        self._fill(self.lookahead)
+        return item
+
+    def _fill(self, target):
+        while not self._closed and len(self._queue) < target:
+            batch = list(islice(self._contacts, self.batch_size))
+            if not batch:
+                return
+            if len(batch) == 1:
+                idx, contact = batch[0]
+                future = self._executor.submit(contextvars.copy_context().run, self._prepare, contact)
+                self._queue.append((idx, contact, future))
+            else:
+                futures = [Future() for _ in batch]
+                self._executor.submit(
+                    contextvars.copy_context().run, self._prepare_batch, [contact for _, contact in batch], futures
+                )
+                self._queue.extend((idx, contact, future) for (idx, contact), future in zip(batch, futures))
+
+    def _note_request(self, contact, profile_data):
+        return {
+            'name': contact['Name'],
+            'company': contact['Company'],
+            'role': contact['Role'],
+            'service_1': contact.get('services and products_1', ''),
+            'service_2': contact.get('services and products_2', ''),
+            'profile_data': profile_data
+        }
+
+    def _prepare(self, contact):
+        """Read the contact's profile in the prefetch tab, then draft the note without holding the driver"""
+        started = time.monotonic()
+        with self.driver_lock:
+            profile_data = self._fetch_profile(contact['LinkedIn_profile'])
+
+        message = self.automation.generate_message(**self._note_request(contact, profile_data))
+        logger.info(f"📨 Draft ready for {contact['Name']} in {time.monotonic() - started:.1f}s")
+        return profile_data, message
+
+    def _prepare_batch(self, contacts, futures):
+        """Read each contact's profile, then draft all of their notes with one AI request"""
+        started = time.monotonic()
+        try:
+            profiles = []
+            for contact in contacts:
+                with self.driver_lock:
+                    profiles.append(self._fetch_profile(contact['LinkedIn_profile']))
+            messages = self.automation.generate_messages(
+                [self._note_request(contact, profile_data) for contact, profile_data in zip(contacts, profiles)]
+            )
+        except Exception as e:
+            for future in futures:
+                self._settle(future, exception=e)
+            return
+
+        for future, profile_data, message in zip(futures, profiles, messages):
+            self._settle(future, result=(profile_data, message))
+        logger.info(f"📨 {len(contacts)} drafts ready in {time.monotonic() - started:.1f}s")
+
+    @staticmethod
+    def _settle(future, result=None, exception=None):
+        if future.cancelled():
+            return
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except InvalidStateError:
+            pass  # cancelled while we were working on it
+
+    def _fetch_profile(self, linkedin_url):
+        # Called with driver_lock held; once close() has run the session may belong to another job
+        if self._closed:
+            raise RuntimeError("Draft prefetcher closed")
+        driver = self.automation.driver
+        try:
+            if self._prefetch_handle not in driver.window_handles:
+                driver.switch_to.window(self._main_handle)
+                driver.execute_script("window.open('about:blank', '_blank');")
+                self._prefetch_handle = driver.window_handles[-1]
+            driver.switch_to.window(self._prefetch_handle)
+            driver.get(linkedin_url)
+            return self.automation.extract_profile_data()
+        finally:
+            driver.switch_to.window(self._main_handle)
+
+    def close(self):
+        """Drop queued work and close the prefetch tab; no driver access happens after this returns"""
+        self._closed = True
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self.driver_lock:
+            try:
+                driver = self.automation.driver
+                if self._prefetch_handle in driver.window_handles:
+                    driver.switch_to.window(self._prefetch_handle)
+                    driver.close()
+                driver.switch_to.window(self._main_handle)
+            except Exception as e:
+                logger.debug(f"Could not close prefetch tab: {e}")
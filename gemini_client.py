@@ -0,0 +1,354 @@
+import re
+import time
+import random
+import logging
+import threading
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = 'gemini-1.5-flash'
+DEFAULT_REQUESTS_PER_MINUTE = 15
+
+RATE_LIMIT_ERRORS = {'ResourceExhausted', 'TooManyRequests'}
+TRANSIENT_ERRORS = {'ServiceUnavailable', 'InternalServerError', 'DeadlineExceeded', 'GatewayTimeout'}
+
+_RETRY_HINT_PATTERNS = (
+    re.compile(r'retry_delay\s*\{\s*seconds:\s*(\d+)'),
+    re.compile(r'retry in ([\d.]+)\s*s', re.IGNORECASE),
+    re.compile(r'retry[- ]after:?\s*([\d.]+)', re.IGNORECASE),
+)
+
+
+def is_rate_limit_error(error):
+    return type(error).__name__ in RATE_LIMIT_ERRORS or "429" in str(error)
+
+
+def is_transient_error(error):
+    if type(error).__name__ in TRANSIENT_ERRORS or isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    return re.search(r'\b50[0234]\b', str(error)) is not None
+
+
+def retry_hint(error):
+    """Seconds the API asked us to wait before retrying, if it said"""
+    delay = getattr(error, 'retry_delay', None)
+    if isinstance(delay, (int, float)):
+        return float(delay)
+    message = str(error)
+    for pattern in _RETRY_HINT_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket refilled at `rate` tokens/second, up to `capacity`.
+
+    The rate adapts: penalize() halves it after a 429 and reward() creeps it
+    back towards the configured rate on each success.
+    """
+
+    def __init__(self, rate, capacity=None, min_rate=None):
+        self.max_rate = float(rate)
+        self.rate = float(rate)
+        self.min_rate = float(min_rate) if min_rate else self.max_rate / 8
+        self.capacity = float(capacity or max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, timeout=None):
+        """Take one token, waiting for it if needed; False if `timeout` runs out first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None:
+                if now + wait > deadline:
+                    return False
+            time.sleep(wait)
+
+    def penalize(self):
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = min(self._tokens, 0.0)
+
+    def reward(self):
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 20)
+
+
+class GeminiMetrics:
+    """Per-call latency / error counters for one API key"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.successes = 0
+        self.errors = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self.limiter_wait = 0.0
+        self.last_error = None
+
+    def record(self, latency, error=None):
+        with self._lock:
+            self.calls += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            if error is None:
+                self.successes += 1
+            else:
+                self.errors += 1
+                self.last_error = f"{type(error).__name__}: {error}"[:200]
+                if is_rate_limit_error(error):
+                    self.rate_limited += 1
+
+    def record_retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def record_wait(self, seconds):
+        with self._lock:
+            self.limiter_wait += seconds
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'successes': self.successes,
+                'errors': self.errors,
+                'retries': self.retries,
+                'rate_limited': self.rate_limited,
+                'avg_latency': round(self.total_latency / self.calls, 3) if self.calls else 0.0,
+                'max_latency': round(self.max_latency, 3),
+                'limiter_wait': round(self.limiter_wait, 3),
+                'last_error': self.last_error
+            }
+
+
+class GeminiClient:
+    """
+    Drop-in wrapper around a genai.GenerativeModel.
+
+    Every generate_content() call first takes a token from the limiter
+    shared by all clients on the same API key, then retries rate-limit and
+    transient errors with jittered exponential backoff, waiting at least as
+    long as any retry hint the API returned. Anything else (and the last
+    failure once retries run out) is raised to the caller.
+    """
+
+    def __init__(self, model, api_key="", requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 max_retries=4, backoff_base=2.0, backoff_max=60.0):
+        self.model = model
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter, self.metrics = _shared_quota(api_key, requests_per_minute)
+
+    def generate_content(self, prompt, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            waited = time.monotonic()
+            self.limiter.acquire()
+            self.metrics.record_wait(time.monotonic() - waited)
+
+            started = time.monotonic()
+            try:
+                response = self.model.generate_content(prompt, **kwargs)
+            except Exception as e:
+                self.metrics.record(time.monotonic() - started, e)
+                rate_limited = is_rate_limit_error(e)
+                if attempt >= self.max_retries or not (rate_limited or is_transient_error(e)):
+                    raise
+                if rate_limited:
+                    self.limiter.penalize()
+
+                delay = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+                delay = random.uniform(delay / 2, delay)
+                hint = retry_hint(e)
+                if hint is not None:
+                    delay = max(delay, hint)
+                self.metrics.record_retry()
+                logger.warning(f"⏳ Gemini {'rate limit' if rate_limited else 'error'} ({type(e).__name__}). "
+                               f"Retrying in {delay:.1f} seconds...")
+                time.sleep(delay)
+                continue
+
+            self.metrics.record(time.monotonic() - started)
+            self.limiter.reward()
+            return response
+
+    def __getattr__(self, name):
+        # Anything else (count_tokens, start_chat, ...) goes straight to the model
+        if name == 'model':
+            raise AttributeError(name)
+        return getattr(self.model, name)
+
+
+_quotas = {}
+_quotas_lock = threading.Lock()
+
+
+def _shared_quota(api_key, requests_per_minute):
+    with _quotas_lock:
+        quota = _quotas.get(api_key)
+        if quota is None:
+            rate = max(requests_per_minute, 1) / 60.0
+            quota = (TokenBucket(rate, capacity=max(1, requests_per_minute // 4)), GeminiMetrics())
+            _quotas[api_key] = quota
+        return quota
+
+
+def gemini_metrics():
+    """Metrics snapshot per API key (keys masked to their last 4 characters)"""
+    with _quotas_lock:
+        quotas = list(_quotas.items())
+    return {_mask(api_key): metrics.snapshot() for api_key, (_, metrics) in quotas}
+
+
+# Process-wide model registry: one GeminiClient per (API key, model name)
+_models = {}
+_models_lock = threading.RLock()
+# Builds the raw model for (api_key, model_name); None means google.generativeai
+_model_factory = None
+
+
+def set_model_factory(factory):
+    """
+    Build models with `factory(api_key, model_name)` instead of
+    google.generativeai (e.g. a fake for offline load tests). Anything with
+    generate_content() and count_tokens() will do. Clears the registry so
+    models are rebuilt on next use; pass None to go back to Gemini.
+    """
+    global _model_factory
+    with _models_lock:
+        _model_factory = factory
+        _models.clear()
+
+
+def _mask(api_key):
+    return f"...{api_key[-4:]}" if api_key else "default"
+
+
+# A model that failed to initialize is retried after this many seconds, doubling per failure
+INIT_RETRY_BASE = 30.0
+INIT_RETRY_MAX = 15 * 60.0
+
+
+def _build_model(api_key, model_name):
+    """Raw model bound to `api_key`; call with _models_lock held"""
+    if _model_factory is not None:
+        return _model_factory(api_key, model_name)
+    import google.generativeai as genai
+    from google.generativeai import client as genai_client
+    genai.configure(api_key=api_key)
+    model = genai.GenerativeModel(model_name)
+    # GenerativeModel binds its API client on first call, to whichever key was configured
+    # last by then; bind it now, while this key is the configured one
+    model._client = genai_client.get_default_generative_client()
+    return model
+
+
+def get_gemini_model(api_key, model_name=DEFAULT_MODEL, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE):
+    """
+    Shared GeminiClient for this API key, created on first use (None if it can't be).
+
+    genai.configure() sets process-global state, so configuring and
+    building models is serialized here instead of racing per campaign. A
+    failed initialization is retried with backoff on later calls.
+    """
+    if not api_key:
+        return None
+    key = (api_key, model_name)
+    with _models_lock:
+        entry = _models.get(key)
+        if entry is None:
+            entry = {
+                'client': None,
+                'model': model_name,
+                'status': 'initializing',
+                'created_at': datetime.now().isoformat(),
+                'warmup_latency': None,
+                'error': None,
+                'failures': 0,
+                'retry_at': 0.0
+            }
+            _models[key] = entry
+        elif entry['status'] != 'failed':
+            return entry['client']
+        elif time.monotonic() < entry['retry_at']:
+            return None
+
+        try:
+            entry['client'] = GeminiClient(
+                _build_model(api_key, model_name),
+                api_key=api_key,
+                requests_per_minute=requests_per_minute
+            )
+            entry['status'] = 'ready'
+            entry['error'] = None
+            entry['failures'] = 0
+            logger.info(f"✅ Gemini model {model_name} initialized for key {_mask(api_key)}")
+        except Exception as e:
+            entry['failures'] += 1
+            delay = min(INIT_RETRY_MAX, INIT_RETRY_BASE * (2 ** (entry['failures'] - 1)))
+            entry['status'] = 'failed'
+            entry['error'] = str(e)
+            entry['retry_at'] = time.monotonic() + delay
+            logger.error(f"❌ Gemini AI initialization failed: {e} (retrying in {delay:.0f}s)")
+        return entry['client']
+
+
+def warm_up_model(api_key, model_name=DEFAULT_MODEL, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE):
+    """Create the model and make one cheap round-trip so the first real request doesn't pay for the handshake"""
+    client = get_gemini_model(api_key, model_name, requests_per_minute)
+    if client is None:
+        return False
+    entry = _models[(api_key, model_name)]
+    started = time.monotonic()
+    try:
+        client.model.count_tokens("ping")
+        entry['warmup_latency'] = round(time.monotonic() - started, 3)
+        entry['status'] = 'warm'
+        logger.info(f"🔥 Gemini model warmed up in {entry['warmup_latency']}s")
+        return True
+    except Exception as e:
+        entry['status'] = 'degraded'
+        entry['error'] = str(e)
+        logger.warning(f"⚠️ Gemini warm-up failed: {e}")
+        return False
+
+
+def model_health():
+    """Status of every registered model, for /health"""
+    metrics = gemini_metrics()
+    with _models_lock:
+        entries = list(_models.items())
+    return [
+        {
+            'api_key': _mask(api_key),
+            'model': entry['model'],
+            'status': entry['status'],
+            'created_at': entry['created_at'],
+            'warmup_latency': entry['warmup_latency'],
+            'error': entry['error'],
+            'metrics': metrics.get(_mask(api_key))
+        }
+        for (api_key, _), entry in entries
+    ]
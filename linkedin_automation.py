@@ -2,7 +2,6 @@ import csv
 import os
 import time
 import random
-import google.generativeai as genai
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -18,28 +17,24 @@ from selenium.webdriver.common.action_chains import ActionChains
 import logging
 from urllib.parse import urlparse, quote_plus
 import re
-import sys
 import json
-import pandas as pd
 from datetime import datetime
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
-import psutil
 import tempfile
 import platform
 import shutil
 import atexit
 import uuid
+from profile_store import get_tracked_store
+from message_cache import get_message_cache
+from gemini_client import get_gemini_model
+from page_ready import wait_until_ready, wait_until_replaced, SEARCH_RESULTS_MARKER
+from selector_stats import find_first
+from profile_extract import extract_profile
+from tracing import traced, set_status
+from search_harvest import harvest_search_results, connectable
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('linkedin_automation.log', encoding='utf-8'),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
@@ -76,25 +71,31 @@ def _open_tab_and_wait(driver, url: str, title_contains: str = "", timeout: int
             lambda d: title_contains.lower() in d.title.lower()
         )
 
+# Part of the message cache key; bump when the note prompt or model changes
+NOTE_PROMPT_VERSION = 'gemini-1.5-flash/note-v1'
+
 class LinkedInAutomation:
-    def __init__(self, email, password, api_key):
+    def __init__(self, email, password, api_key, model=None):
         self.email = email
         self.password = password
         self.api_key = api_key
         self.driver = None
         self.wait = None
-        self.model = None
+        self.model = model
         self.tracked_profiles_file = 'messaged_profiles.json'
-        self.tracked_profiles = set()
+        self.tracked_store = None
+        self.message_cache = get_message_cache()
         self.persistent_profile_dir = None
         
         self.setup_driver()
-        self.setup_ai()
+        if self.model is None:
+            self.setup_ai()
         self.load_tracked_profiles()
         
         # Try to restore existing session
         self._load_session_cookies()
 
+    @traced('driver_startup')
     def setup_driver(self):
         """Initialize Chrome with persistent session management"""
         try:
@@ -163,6 +164,7 @@ class LinkedInAutomation:
         # Switch to the newest tab
         self.driver.switch_to.window(self.driver.window_handles[-1])
 
+    @traced('login', ok=bool)
     def login(self):
         """Enhanced login with session validation and persistence"""
         try:
@@ -170,7 +172,7 @@ class LinkedInAutomation:
             
             # First, navigate to LinkedIn feed to check existing session
             self.driver.get("https://www.linkedin.com/feed")
-            time.sleep(3)
+            wait_until_ready(self.driver, 'feed')
             
             # Check if already logged in
             if self._is_logged_in():
@@ -500,7 +502,7 @@ class LinkedInAutomation:
             current_url = self.driver.current_url
             if "linkedin.com" not in current_url:
                 self.driver.get("https://www.linkedin.com/feed")
-                time.sleep(2)
+                wait_until_ready(self.driver, 'feed')
                 
             return self._is_logged_in()
             
@@ -532,47 +534,34 @@ class LinkedInAutomation:
                 pass
 
     def setup_ai(self):
-        """Initialize Gemini AI"""
-        try:
-            genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
-            logger.info("✅ Gemini AI initialized successfully")
-        except Exception as e:
-            logger.error(f"❌ Gemini AI initialization failed: {e}")
-            self.model = None
+        """Use the process-wide Gemini model for this API key"""
+        self.model = get_gemini_model(self.api_key)
             
     def load_tracked_profiles(self):
-        """Load previously messaged profiles to avoid duplicates"""
-        if os.path.exists(self.tracked_profiles_file):
-            try:
-                with open(self.tracked_profiles_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    self.tracked_profiles = set(data)
-                    logger.info(f"✅ Loaded {len(self.tracked_profiles)} previously messaged profiles")
-            except Exception as e:
-                logger.warning(f"⚠️ Could not load tracked profiles: {e}")
-                self.tracked_profiles = set()
-        else:
-            self.tracked_profiles = set()
+        """Open the shared tracked-profile store (migrates messaged_profiles.json once)"""
+        try:
+            self.tracked_store = get_tracked_store(legacy_json_file=self.tracked_profiles_file)
+            logger.info(f"✅ Loaded {self.tracked_store.count()} previously messaged profiles")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load tracked profiles: {e}")
+            self.tracked_store = None
             
     def save_tracked_profiles(self):
-        """Save tracked profiles to file"""
+        """Commit any batched tracked-profile writes"""
         try:
-            with open(self.tracked_profiles_file, 'w', encoding='utf-8') as f:
-                json.dump(list(self.tracked_profiles), f, ensure_ascii=False, indent=2)
-                logger.info(f"✅ Saved {len(self.tracked_profiles)} tracked profiles")
+            if self.tracked_store:
+                self.tracked_store.flush()
         except Exception as e:
             logger.error(f"❌ Could not save tracked profiles: {e}")
             
     def is_profile_messaged(self, profile_url):
         """Check if profile has been messaged before"""
-        return profile_url in self.tracked_profiles
+        return bool(self.tracked_store and self.tracked_store.contains(profile_url))
         
     def add_profile_to_tracked(self, profile_url):
         """Add profile to tracked list"""
-        self.tracked_profiles.add(profile_url)
-        self.save_tracked_profiles()
-        logger.info(f"📝 Added profile to tracked list: {profile_url}")
+        if self.tracked_store and self.tracked_store.add(profile_url):
+            logger.info(f"📝 Added profile to tracked list: {profile_url}")
         
     def human_delay(self, min_seconds=1, max_seconds=3):
         """Add human-like delays"""
@@ -707,79 +696,19 @@ class LinkedInAutomation:
                 logger.warning(f"Safe click failed: {e}")
                 return False
                 
+    @traced('extract_profile_data')
     def extract_profile_data(self):
         """Extract profile data from current LinkedIn profile page"""
-        profile_data = {}
-        
         try:
             # Wait for profile to load
-            self.wait.until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "h1")),
-                    EC.presence_of_element_located((By.CSS_SELECTOR, ".pv-text-details__left-panel"))
-                )
-            )
-            
-            # Extract name
-            name_selectors = [
-                "h1.text-heading-xlarge",
-                ".pv-text-details__left-panel h1",
-                "[data-test-id='profile-name'] h1",
-                ".ph5 h1"
-            ]
+            wait_until_ready(self.driver, 'profile', timeout=10)
             
-            for selector in name_selectors:
-                try:
-                    name_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    profile_data['extracted_name'] = name_elem.text.strip()
-                    logger.info(f"📝 Extracted name: {profile_data['extracted_name']}")
-                    break
-                except NoSuchElementException:
-                    continue
-                    
-            # Extract headline
-            headline_selectors = [
-                ".text-body-medium.break-words",
-                ".pv-text-details__left-panel .text-body-medium",
-                "[data-test-id='profile-headline']"
-            ]
-            
-            for selector in headline_selectors:
-                try:
-                    headline_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    headline_text = headline_elem.text.strip()
-                    if headline_text and headline_text != profile_data.get('extracted_name', ''):
-                        profile_data['extracted_headline'] = headline_text
-                        logger.info(f"💼 Extracted headline: {headline_text[:50]}...")
-                        break
-                except NoSuchElementException:
-                    continue
-                    
-            # Extract about section
-            about_selectors = [
-                "[data-test-id='about-section'] .pv-shared-text-with-see-more span[aria-hidden='true']",
-                ".pv-about-section .pv-shared-text-with-see-more span"
-            ]
-            
-            for selector in about_selectors:
-                try:
-                    about_elem = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    about_text = about_elem.text.strip()
-                    if about_text:
-                        profile_data['about_snippet'] = about_text[:150] + "..." if len(about_text) > 150 else about_text
-                        logger.info(f"📄 Extracted about: {profile_data['about_snippet'][:50]}...")
-                        break
-                except NoSuchElementException:
-                    continue
-                    
-            # Set defaults
-            if not profile_data.get('extracted_name'):
-                profile_data['extracted_name'] = "Professional"
-            if not profile_data.get('about_snippet'):
-                profile_data['about_snippet'] = ""
+            # Name, headline and about in a single script round trip
+            profile_data = extract_profile(self.driver)
                 
         except Exception as e:
             logger.warning(f"⚠️ Profile data extraction failed: {e}")
+            set_status('failed')
             profile_data = {
                 'extracted_name': 'Professional',
                 'extracted_headline': '',
@@ -788,12 +717,8 @@ class LinkedInAutomation:
             
         return profile_data
         
-    def generate_message(self, name, company, role, service_1="", service_2="", profile_data=None):
-        """Generate personalized LinkedIn message using AI"""
-        if not self.model:
-            fallback_msg = f"Hi {name}, I'm impressed by your work as {role} at {company}. I'd love to connect and learn more about your experience in {service_1 or 'your field'}. Looking forward to connecting!"
-            return fallback_msg[:280]
-            
+    def _note_prompt(self, name, company, role, service_1="", profile_data=None):
+        """Render the connection-note prompt for one contact; returns (prompt, actual_name)"""
         actual_name = profile_data.get('extracted_name', name) if profile_data else name
         about_snippet = profile_data.get('about_snippet', '') if profile_data else ''
         headline = profile_data.get('extracted_headline', role) if profile_data else role
@@ -819,34 +744,143 @@ class LinkedInAutomation:
         **Example:** "Hi Jane, I was impressed by your work in product strategy at TechCorp. I'm also in the product space and would love to connect and exchange ideas. Thanks!"
 
 Return ONLY the message text, no labels or formatting."""
+        return message_template, actual_name
 
-        for attempt in range(3):
-            try:
-                response = self.model.generate_content(message_template)
-                message = response.text.strip()
-                
-                # Clean up message
-                message = re.sub(r'^(Message:|Icebreaker:)\s*', '', message, flags=re.IGNORECASE)
-                message = message.strip('"\'[]')
-                
-                if len(message) > 280:
-                    message = message[:277] + "..."
-                    
-                return message
+    @traced('generate_message')
+    def generate_message(self, name, company, role, service_1="", service_2="", profile_data=None):
+        """Generate personalized LinkedIn message using AI"""
+        if not self.model:
+            fallback_msg = f"Hi {name}, I'm impressed by your work as {role} at {company}. I'd love to connect and learn more about your experience in {service_1 or 'your field'}. Looking forward to connecting!"
+            return fallback_msg[:280]
+            
+        message_template, actual_name = self._note_prompt(name, company, role, service_1, profile_data)
+
+        cached = self.message_cache.get(message_template, NOTE_PROMPT_VERSION)
+        if cached:
+            logger.info(f"♻️ Using cached message for {actual_name}")
+            return cached
+
+        try:
+            response = self.model.generate_content(message_template)
+            message = self._clean_note(response.text)
+            
+            if len(message) > 280:
+                message = message[:277] + "..."
                 
-            except Exception as e:
-                if "429" in str(e) or "ResourceExhausted" in str(e):
-                    wait_time = 30 * (attempt + 1)
-                    logger.warning(f"⏳ AI rate limit hit. Retrying in {wait_time} seconds...")
-                    time.sleep(wait_time)
-                else:
-                    logger.error(f"❌ AI generation error: {e}")
-                    break
+            self.message_cache.put(message_template, message, NOTE_PROMPT_VERSION)
+            return message
+            
+        except Exception as e:
+            logger.error(f"❌ AI generation error: {e}")
+            set_status('failed')
                     
         # Fallback message
         fallback_msg = f"Hi {actual_name}, I'm impressed by your {role} work at {company}. I'd love to connect and exchange insights about {service_1 or 'industry trends'}. Looking forward to connecting!"
         return fallback_msg[:280]
     
+    def _clean_note(self, text):
+        """Strip labels and quotes the model sometimes wraps a note in"""
+        message = re.sub(r'^(Message:|Icebreaker:)\s*', '', text.strip(), flags=re.IGNORECASE)
+        return message.strip('"\'[]').strip()
+
+    @traced('generate_messages')
+    def generate_messages(self, items):
+        """
+        Generate notes for several contacts with a single Gemini request.
+
+        `items` is a list of generate_message() keyword dicts (name,
+        company, role, service_1, service_2, profile_data). Cached notes are
+        reused; the rest are asked for as one JSON array. If the array
+        doesn't hold exactly one note per pending contact it is discarded;
+        items without a valid (non-empty, <= 280 chars) note fall back to
+        individual generate_message() calls. Returns the notes in the
+        order given.
+        """
+        if not self.model:
+            return [self.generate_message(**item) for item in items]
+
+        messages = [None] * len(items)
+        pending = []
+        for i, item in enumerate(items):
+            prompt, actual_name = self._note_prompt(
+                item['name'], item['company'], item['role'],
+                item.get('service_1', ''), item.get('profile_data')
+            )
+            cached = self.message_cache.get(prompt, NOTE_PROMPT_VERSION)
+            if cached:
+                messages[i] = cached
+            else:
+                pending.append((i, prompt, actual_name))
+
+        if len(pending) > 1:
+            people = []
+            for n, (i, _, actual_name) in enumerate(pending, 1):
+                item = items[i]
+                profile_data = item.get('profile_data') or {}
+                people.append(
+                    f"{n}. Name: {actual_name}\n"
+                    f"   Company: {item['company']}\n"
+                    f"   Headline: {profile_data.get('extracted_headline', item['role'])}\n"
+                    f"   'About' snippet: \"{profile_data.get('about_snippet', '')}\"\n"
+                    f"   Context about me (the sender): {item.get('service_1', '')}"
+                )
+            batch_prompt = f"""You are a professional networking assistant. For EACH of the {len(pending)} people below, write a personalized, concise, and professional LinkedIn connection request note (under 280 characters).
+
+**People:**
+{chr(10).join(people)}
+
+**Instructions for every note:**
+1.  Start with "Hi <first name>,".
+2.  Briefly mention a specific, impressive detail from their headline or company.
+3.  State the reason for connecting clearly and concisely, using the sender context.
+4.  Keep it professional, friendly, and under the character limit.
+
+Return ONLY a JSON array of exactly {len(pending)} strings, one note per person in the order listed. No labels, numbering or explanations."""
+
+            notes = []
+            try:
+                response = self.model.generate_content(batch_prompt)
+                notes = self._parse_note_array(response.text, len(pending))
+            except Exception as e:
+                logger.error(f"❌ AI batch generation error: {e}")
+                set_status('failed')
+
+            valid = 0
+            for (i, prompt, _), note in zip(pending, notes):
+                if isinstance(note, str):
+                    note = self._clean_note(note)
+                    if note and len(note) <= 280:
+                        messages[i] = note
+                        self.message_cache.put(prompt, note, NOTE_PROMPT_VERSION)
+                        valid += 1
+            logger.info(f"📦 Batch generated {valid}/{len(pending)} notes in one request")
+
+        # Anything still missing gets the single-contact treatment
+        for i, item in enumerate(items):
+            if messages[i] is None:
+                messages[i] = self.generate_message(**item)
+        return messages
+
+    def _parse_note_array(self, text, expected):
+        """Pull the JSON array of notes out of a batch response ([] if it isn't one of exactly `expected` notes)"""
+        start, end = text.find('['), text.rfind(']')
+        if start == -1 or end <= start:
+            logger.warning("⚠️ Batch response contained no JSON array")
+            return []
+        try:
+            notes = json.loads(text[start:end + 1])
+        except ValueError as e:
+            logger.warning(f"⚠️ Could not parse batch response: {e}")
+            return []
+        if not isinstance(notes, list):
+            return []
+        if len(notes) != expected:
+            # Notes are matched to contacts by position; one missing or extra note would shift
+            # every later note onto the wrong person, so the whole batch is discarded
+            logger.warning(f"⚠️ Batch response had {len(notes)} notes, expected {expected}; discarding batch")
+            return []
+        return notes
+
     def send_message(self, message, name, company):
         """Enhanced send_message function with standardized priority order and user confirmation"""
         logger.info(f"🚀 Starting outreach process for {name} at {company}")
@@ -1462,8 +1496,8 @@ Return ONLY the message text, no labels or formatting."""
         except Exception as e:
             logger.error(f"❌ Error sending message: {e}")
             return False
-    def process_inbox_replies(self, max_replies=5):
-        """Process unread messages with improved reliability."""
+    def process_inbox_replies(self, max_replies=5, stream_replies=False):
+        """Process unread messages with improved reliability (stream_replies types replies as they are generated)."""
         logger.info("🤖 Starting AI inbox processing...")
         results = []
         
@@ -1523,11 +1557,14 @@ Return ONLY the message text, no labels or formatting."""
                         self.navigate_to_messaging()
                         continue
                     
-                    # Generate AI response
-                    ai_reply = self.generate_ai_chat_response(history)
+                    # Generate AI response and send it
+                    if stream_replies:
+                        sent, ai_reply = self.stream_chat_reply(history)
+                    else:
+                        ai_reply = self.generate_ai_chat_response(history)
+                        sent = self.send_chat_message(ai_reply)
                     
-                    # Send response
-                    if self.send_chat_message(ai_reply):
+                    if sent:
                         logger.info(f"✅ Replied to {name}")
                         results.append({"name": name, "status": "replied", "message": ai_reply})
                     else:
@@ -1661,7 +1698,7 @@ Return ONLY the message text, no labels or formatting."""
             f"?keywords={quote_plus(keywords)}&origin=GLOBAL_SEARCH_HEADER"
         )
         self.driver.get(url)
-        time.sleep(3)
+        wait_until_ready(self.driver, 'search_results')
 
         sent_count = 0
         page_loops = 0
@@ -1670,23 +1707,25 @@ Return ONLY the message text, no labels or formatting."""
         while sent_count < max_invites and page_loops < 10:
             logger.info(f"📊 Status: {sent_count}/{max_invites} invitations sent (attempts: {total_attempts})")
 
-            connect_buttons = self.find_connect_buttons_enhanced()
-            if not connect_buttons:
+            # Names, URLs and button states for the whole page in one round trip
+            connect_cards = connectable(harvest_search_results(self.driver))
+            logger.info(f"Found {len(connect_cards)} available connect buttons")
+            if not connect_cards:
                 logger.info("No connect buttons found on this page.")
                 if not self.go_to_next_page():
                     break
                 page_loops += 1
                 continue
 
-            for button in connect_buttons:
+            for card in connect_cards:
                 if sent_count >= max_invites:
                     logger.info(f"🎯 Target reached: {sent_count}/{max_invites}")
                     return sent_count
 
-                try:
-                    name = self.extract_name_from_search_result(button)
-                except Exception:
-                    name = "Professional"
+                button, name, profile_url = card['button'], card['name'], card['profile_url']
+                if profile_url and self.is_profile_messaged(profile_url):
+                    logger.info(f"⏭️ Skipping {name} - already messaged")
+                    continue
 
                 logger.info(f"🔄 Attempting to connect with {name}")
 
@@ -1695,6 +1734,8 @@ Return ONLY the message text, no labels or formatting."""
 
                 if success:
                     sent_count += 1
+                    if profile_url:
+                        self.add_profile_to_tracked(profile_url)
                     logger.info(f"✅ Invitation sent to {name} ({sent_count}/{max_invites})")
                     self.human_delay(2, 4)
                 else:
@@ -1713,18 +1754,15 @@ Return ONLY the message text, no labels or formatting."""
     
     # --- Start of New AI Response Feature ---
 
+    @traced('navigation', page='messaging', ok=bool)
     def navigate_to_messaging(self):
         """Navigates to the LinkedIn messaging page with improved reliability."""
         logger.info("Navigating to LinkedIn messaging...")
         try:
             self.driver.get("https://www.linkedin.com/messaging")
             # Wait for either new or old messaging UI
-            WebDriverWait(self.driver, 15).until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "ul.msg-conversations-container__conversations-list")),  # New UI
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "div.msg-threads"))  # Old UI
-                )
-            )
+            if not wait_until_ready(self.driver, 'messaging'):
+                raise TimeoutException("messaging page did not load")
             logger.info("Successfully loaded messaging page.")
             self.human_delay(2, 3)
             return True
@@ -1807,20 +1845,8 @@ Return ONLY the message text, no labels or formatting."""
 
 
 
-    def generate_ai_chat_response(self, conversation_history, user_persona="a helpful professional assistant"):
-        """
-        Generates a contextual response to a conversation using Gemini AI.
-        """
-        if not self.model:
-            logger.error("AI model is not initialized. Cannot generate response.")
-            return "Sorry, I am unable to generate a response at this time."
-
-        if not conversation_history:
-            logger.warning("Conversation history is empty. Cannot generate a contextual response.")
-            return "Could you please provide more context?"
-            
-        logger.info("Generating AI response for the chat...")
-
+    def _chat_reply_prompt(self, conversation_history):
+        """Render the inbox-reply prompt for a conversation"""
         # Format the conversation history for the AI prompt
         formatted_history = "\n".join([f"{msg['sender']}: {msg['message']}" for msg in conversation_history])
         
@@ -1843,15 +1869,39 @@ Recent messages:
 {formatted_history}
 
 Response:"""
+        return prompt
+
+    def _clean_chat_reply(self, text):
+        """Strip surrounding whitespace and any label the model put in front of the reply"""
+        return re.sub(r'^(Your Response:|Response:)\s*', '', text.strip(), flags=re.IGNORECASE).strip()
+
+    @traced('generate_chat_reply')
+    def generate_ai_chat_response(self, conversation_history, user_persona="a helpful professional assistant"):
+        """
+        Generates a contextual response to a conversation using Gemini AI.
+        """
+        return self._generate_chat_reply(conversation_history)
+
+    def _generate_chat_reply(self, conversation_history):
+        """Body of generate_ai_chat_response(), for callers already inside a generate_chat_reply span"""
+        if not self.model:
+            logger.error("AI model is not initialized. Cannot generate response.")
+            return "Sorry, I am unable to generate a response at this time."
+
+        if not conversation_history:
+            logger.warning("Conversation history is empty. Cannot generate a contextual response.")
+            return "Could you please provide more context?"
+            
+        logger.info("Generating AI response for the chat...")
+        prompt = self._chat_reply_prompt(conversation_history)
         try:
             response = self.model.generate_content(prompt)
-            ai_message = response.text.strip()
-            # Clean up any AI-added labels
-            ai_message = re.sub(r'^(Your Response:|Response:)\s*', '', ai_message, flags=re.IGNORECASE)
+            ai_message = self._clean_chat_reply(response.text)
             logger.info(f"AI generated response: {ai_message}")
             return ai_message
         except Exception as e:
             logger.error(f"AI response generation failed: {e}")
+            set_status('failed')
             return "I appreciate you reaching out. Let me review this and get back to you shortly."
 
     def send_chat_message(self, message):
@@ -1878,21 +1928,7 @@ Response:"""
             self.type_like_human(message_box, message)
             self.human_delay(1, 2)
             
-            # Find and click the send button
-            send_button = self.driver.find_element(
-                By.CSS_SELECTOR, 
-                "button.msg-form__send-button[type='submit'], button.msg-form-send-button"
-            )
-            
-            # Ensure button is enabled
-            if send_button.is_enabled():
-                self.safe_click(send_button)
-                logger.info("Message sent successfully.")
-                self.human_delay(2, 4)
-                return True
-            else:
-                logger.error("Send button is disabled.")
-                return False
+            return self._click_send_button()
                 
         except TimeoutException:
             logger.error("Message input box not found or not interactable.")
@@ -1904,11 +1940,103 @@ Response:"""
             logger.error(f"Failed to send message: {e}")
             return False
 
-    def ai_respond_to_conversation(self, conversation_name):
+    def _click_send_button(self):
+        """Click the chat send button; raises NoSuchElementException if it isn't there"""
+        send_button = self.driver.find_element(
+            By.CSS_SELECTOR, 
+            "button.msg-form__send-button[type='submit'], button.msg-form-send-button"
+        )
+        
+        # Ensure button is enabled
+        if send_button.is_enabled():
+            self.safe_click(send_button)
+            logger.info("Message sent successfully.")
+            self.human_delay(2, 4)
+            return True
+        logger.error("Send button is disabled.")
+        return False
+
+    def _type_reply_delta(self, message_box, typed, target):
+        """Type whatever `target` adds beyond the already-typed prefix; returns what is now typed"""
+        if not target.startswith(typed):
+            return typed  # the model rewrote the start (e.g. a label) - fixed up before sending
+        for char in target[len(typed):]:
+            message_box.send_keys(char)
+            time.sleep(random.uniform(0.05, 0.2))
+        return target
+
+    @traced('generate_chat_reply', ok=lambda result: result[0], streamed=True)
+    def stream_chat_reply(self, conversation_history):
+        """
+        Reply in the active chat, typing the AI response as Gemini streams it.
+
+        Typing starts with the first tokens instead of after the full
+        response. Before clicking send, the text in the message box is
+        checked against the complete cleaned reply and retyped if they
+        differ. If streaming fails, falls back to generate-then-send.
+        Returns (sent, reply).
+        """
+        if not self.model:
+            reply = self._generate_chat_reply(conversation_history)
+            return self.send_chat_message(reply), reply
+
+        message_box_selector = "div.msg-form__contenteditable[role='textbox']"
+        try:
+            message_box = WebDriverWait(self.driver, 10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, message_box_selector))
+            )
+            self.driver.execute_script("arguments[0].innerText = '';", message_box)
+            message_box.send_keys(" ")  # Trigger any required events
+            self.driver.execute_script("arguments[0].innerText = '';", message_box)
+
+            started = time.monotonic()
+            first_token_at = None
+            full_text, typed = "", ""
+            prompt = self._chat_reply_prompt(conversation_history)
+            for chunk in self.model.generate_content(prompt, stream=True):
+                full_text += chunk.text
+                if first_token_at is None:
+                    first_token_at = time.monotonic() - started
+                # Hold the first few characters back so a leading "Response:" label can be stripped
+                if len(full_text) < 20:
+                    continue
+                typed = self._type_reply_delta(message_box, typed, self._clean_chat_reply(full_text))
+
+            reply = self._clean_chat_reply(full_text)
+            typed = self._type_reply_delta(message_box, typed, reply)
+            logger.info(f"AI streamed response in {time.monotonic() - started:.1f}s "
+                        f"(first tokens after {first_token_at or 0:.1f}s): {reply}")
+        except Exception as e:
+            logger.warning(f"⚠️ Streaming reply failed ({e}), falling back to a full response")
+            reply = self._generate_chat_reply(conversation_history)
+            return self.send_chat_message(reply), reply
+
+        # Final validation before anything is sent
+        if not reply:
+            logger.error("AI returned an empty response. Message not sent.")
+            self.driver.execute_script("arguments[0].innerText = '';", message_box)
+            return False, reply
+        box_text = self.driver.execute_script("return arguments[0].innerText;", message_box) or ""
+        if " ".join(box_text.split()) != " ".join(reply.split()):
+            logger.warning("⚠️ Drafted text differs from the final response, retyping it")
+            self.driver.execute_script("arguments[0].innerText = '';", message_box)
+            message_box.send_keys(" ")
+            self.driver.execute_script("arguments[0].innerText = '';", message_box)
+            self._type_reply_delta(message_box, "", reply)
+
+        self.human_delay(1, 2)
+        try:
+            return self._click_send_button(), reply
+        except NoSuchElementException:
+            logger.error("Send button not found.")
+            return False, reply
+
+    def ai_respond_to_conversation(self, conversation_name, stream_replies=False):
         """
         Orchestrates the process of reading a conversation and sending an AI-generated reply.
         
         :param conversation_name: The name of the person in the conversation to open.
+        :param stream_replies: Type the reply while it is still being generated.
         """
         logger.info(f"Starting AI response process for conversation with {conversation_name}.")
         
@@ -1945,7 +2073,10 @@ Response:"""
             logger.info("The last message was already sent by you. No response needed.")
             return
 
-        # 4. Generate AI response
+        # 4. Generate AI response (streamed straight into the message box if requested)
+        if stream_replies:
+            self.stream_chat_reply(history)
+            return
         ai_response = self.generate_ai_chat_response(history)
 
         # 5. Send the response
@@ -1969,9 +2100,11 @@ Response:"""
             self.driver.execute_script(
                 "arguments[0].scrollIntoView({block: 'center'});", next_btn
             )
+            # Pagination is client-side: remember the current results so the wait can see them go
+            marker = next(iter(self.driver.find_elements(By.CSS_SELECTOR, SEARCH_RESULTS_MARKER)), None)
+            old_url = self.driver.current_url
             next_btn.click()
-            time.sleep(2)
-            return True
+            return wait_until_replaced(self.driver, 'search_results', marker, old_url, timeout=10)
                 
         except TimeoutException:
             return False
@@ -1979,45 +2112,14 @@ Response:"""
             logger.warning(f"Next page navigation error: {e}")
             return False
     def find_element_safe(self, selectors, timeout=10):
-        """Enhanced element finding with multiple selectors"""
-        for selector_type, selector in selectors:
-            try:
-                if selector_type == "xpath":
-                    element = WebDriverWait(self.driver, timeout).until(
-                        EC.element_to_be_clickable((By.XPATH, selector))
-                    )
-                else:
-                    element = WebDriverWait(self.driver, timeout).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                return element
-            except TimeoutException:
-                continue
-        return None
+        """Enhanced element finding with multiple selectors (raced in one wait, in priority order)"""
+        return find_first(self.driver, selectors, timeout=timeout)
     
     def find_connect_buttons_enhanced(self):
-        """Enhanced button detection with multiple strategies"""
-        selectors = [
-            "//button[contains(text(), 'Connect') and not(contains(@class, 'artdeco-button--disabled'))]",
-            "//button[.//span[text()='Connect'] and not(contains(@class, 'disabled'))]",
-            "//button[contains(@aria-label, 'Connect') and not(@disabled)]"
-        ]
-        
-        buttons = []
-        for selector in selectors:
-            try:
-                found_buttons = self.driver.find_elements(By.XPATH, selector)
-                # Filter out already processed buttons
-                for btn in found_buttons:
-                    if btn.is_displayed() and btn.is_enabled():
-                        buttons.append(btn)
-            except Exception as e:
-                logger.debug(f"Selector failed: {selector}, Error: {e}")
-        
-        # Remove duplicates
-        unique_buttons = list(dict.fromkeys(buttons))
-        logger.info(f"Found {len(unique_buttons)} available connect buttons")
-        return unique_buttons
+        """Enhanced button detection: every result card is read in one script round trip"""
+        buttons = [card['button'] for card in connectable(harvest_search_results(self.driver))]
+        logger.info(f"Found {len(buttons)} available connect buttons")
+        return buttons
     
     def click_connect_and_validate(self, button):
         """Scrolls to and clicks the Connect button, handles the modal, and returns True if the invite went through"""
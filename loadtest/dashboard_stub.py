@@ -0,0 +1,76 @@
+import time
+import logging
+import threading
+from collections import defaultdict
+
+from flask import Flask, request, jsonify
+from werkzeug.serving import make_server
+
+logger = logging.getLogger(__name__)
+
+RECORDED_ENDPOINTS = ('campaign_progress', 'search_results', 'inbox_results', 'register_client_bot')
+
+
+class DashboardStub:
+    """
+    Local stand-in for the dashboard: accepts the client's report POSTs,
+    keeps every body per endpoint and can answer with an injected error
+    status to exercise the reporter's retries. Point the client's
+    dashboard_url at `url`.
+    """
+
+    def __init__(self, port=0, latency=0.0, fail_ratio=0.0):
+        self.latency = latency
+        self.fail_ratio = fail_ratio
+        self.recorded = defaultdict(list)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self.app = self._build_app()
+        self._server = make_server('127.0.0.1', port, self.app, threaded=True)
+        self.url = f"http://127.0.0.1:{self._server.server_port}"
+        self._thread = threading.Thread(target=self._server.serve_forever, name="dashboard-stub", daemon=True)
+
+    def _build_app(self):
+        app = Flask(__name__)
+
+        @app.route('/', methods=['GET'])
+        def index():
+            return jsonify({'status': 'ok'})
+
+        @app.route('/api/<endpoint>', methods=['POST'])
+        def record(endpoint):
+            if endpoint not in RECORDED_ENDPOINTS:
+                return jsonify({'success': False, 'error': 'unknown endpoint'}), 404
+            if self.latency:
+                time.sleep(self.latency)
+            with self._lock:
+                self._requests += 1
+                # Fail exactly `fail_ratio` of the requests, spread evenly
+                failing = int(self._requests * self.fail_ratio) != int((self._requests - 1) * self.fail_ratio)
+                if not failing:
+                    self.recorded[endpoint].append({'received_at': time.time(), 'body': request.get_json(silent=True)})
+            if failing:
+                return jsonify({'success': False, 'error': 'injected failure'}), 503
+            return jsonify({'success': True})
+
+        @app.route('/api/_recorded', methods=['GET'])
+        def recorded():
+            return jsonify(self.counts())
+
+        return app
+
+    def counts(self):
+        with self._lock:
+            return {endpoint: len(bodies) for endpoint, bodies in self.recorded.items()}
+
+    def bodies(self, endpoint):
+        with self._lock:
+            return [entry['body'] for entry in self.recorded.get(endpoint, [])]
+
+    def start(self):
+        self._thread.start()
+        logger.info(f"📡 Dashboard stub listening on {self.url}")
+        return self
+
+    def stop(self):
+        self._server.shutdown()
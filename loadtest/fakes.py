@@ -0,0 +1,186 @@
+import os
+import re
+import sys
+import json
+import time
+import random
+import logging
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from linkedin_automation import LinkedInAutomation
+from message_cache import get_message_cache
+
+logger = logging.getLogger(__name__)
+
+_BATCH_SIZE = re.compile(r'JSON array of exactly (\d+) strings')
+_BATCH_NAMES = re.compile(r'^\d+\. Name: (.+)$', re.MULTILINE)
+_SINGLE_NAME = re.compile(r'Name: (.+)')
+
+
+class ResourceExhausted(Exception):
+    """Same class name as the google.api_core error, so the client treats it as a 429"""
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGeminiModel:
+    """
+    Stand-in for genai.GenerativeModel with a fixed latency (plus jitter)
+    and a share of calls failing with a 429. Seeded, so a run is repeatable.
+    Answers note prompts (single and JSON-array batch) and chat prompts
+    with canned text; stream=True yields the reply in small chunks.
+    """
+
+    def __init__(self, latency=0.3, jitter=0.1, rate_limit_ratio=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_ratio = rate_limit_ratio
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.rate_limited = 0
+
+    def _roll(self):
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            limited = self._random.random() < self.rate_limit_ratio
+            if limited:
+                self.rate_limited += 1
+        time.sleep(delay)
+        if limited:
+            raise ResourceExhausted("429 Resource has been exhausted (e.g. check quota).")
+
+    def _reply(self, prompt):
+        batch = _BATCH_SIZE.search(prompt)
+        if batch:
+            names = _BATCH_NAMES.findall(prompt)[:int(batch.group(1))]
+            return json.dumps([self._note(name) for name in names])
+        if "LinkedIn reply" in prompt:
+            return "Thanks for the message! Happy to continue the conversation, does a quick call next week work for you?"
+        match = _SINGLE_NAME.search(prompt)
+        return self._note(match.group(1) if match else "there")
+
+    def _note(self, name):
+        first_name = name.strip().split()[0] if name.strip() else "there"
+        return f"Hi {first_name}, I came across your work and would love to connect and swap notes on what your team is building."
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        self._roll()
+        text = self._reply(prompt)
+        if stream:
+            return iter([FakeResponse(text[i:i + 8]) for i in range(0, len(text), 8)])
+        return FakeResponse(text)
+
+    def count_tokens(self, contents):
+        return {'total_tokens': len(str(contents).split())}
+
+
+def fake_model_factory(**options):
+    """Factory for gemini_client.set_model_factory(); one FakeGeminiModel per (key, model)"""
+    models = {}
+
+    def factory(api_key, model_name):
+        return models.setdefault((api_key, model_name), FakeGeminiModel(**options))
+
+    factory.models = models
+    return factory
+
+
+class _SwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        if handle not in self._driver.window_handles:
+            raise RuntimeError(f"no such window: {handle}")
+        self._driver.current_window_handle = handle
+
+
+class FakeDriver:
+    """Just enough of a WebDriver for the campaign flow: tabs, navigation and page-ready scripts"""
+
+    def __init__(self, page_load=0.05):
+        self.page_load = page_load
+        self.window_handles = ['tab-0']
+        self.current_window_handle = 'tab-0'
+        self.current_url = 'about:blank'
+        self.switch_to = _SwitchTo(self)
+        self._tabs = 0
+
+    def get(self, url):
+        time.sleep(self.page_load)
+        self.current_url = url
+
+    def execute_script(self, script, *args):
+        if "window.open" in script:
+            self._tabs += 1
+            self.window_handles.append(f'tab-{self._tabs}')
+            return None
+        return True
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+    def quit(self):
+        self.window_handles = []
+
+
+class OfflineAutomation(LinkedInAutomation):
+    """
+    LinkedInAutomation without Chrome or LinkedIn: page work is simulated
+    with fixed delays while the note generation path (prompt, cache,
+    batching, GeminiClient limiter and retries) runs for real against
+    whatever model the gemini_client registry hands out.
+    """
+
+    page_latency = 0.05
+    send_latency = 0.1
+
+    def __init__(self, email, password, api_key, model=None):
+        self.email = email
+        self.password = password
+        self.api_key = api_key
+        self.model = model
+        self.driver = FakeDriver(self.page_latency)
+        self.wait = None
+        self.tracked_profiles_file = 'messaged_profiles.json'
+        self.tracked_store = None
+        self.persistent_profile_dir = None
+        self.message_cache = get_message_cache()
+        self.load_tracked_profiles()
+
+    def login(self):
+        return True
+
+    def _healthy(self):
+        return True
+
+    def extract_profile_data(self):
+        time.sleep(self.page_latency)
+        name = self.driver.current_url.rstrip('/').rsplit('/', 1)[-1].replace('-', ' ').title()
+        return {
+            'extracted_name': name or "Professional",
+            'extracted_headline': "Engineering Manager",
+            'about_snippet': "Building data platforms and growing engineering teams."
+        }
+
+    def send_connection_request_with_note(self, message, name):
+        time.sleep(self.send_latency)
+        return True
+
+    def send_connection_request_without_note(self, name):
+        time.sleep(self.send_latency)
+        return True
+
+    def send_direct_message(self, message, name):
+        time.sleep(self.send_latency)
+        return True
+
+    def close(self):
+        self.driver.quit()
@@ -0,0 +1,218 @@
+"""
+Offline end-to-end load test for the client's Flask API.
+
+Runs EnhancedLinkedInAutomationClient in a scratch directory with a fake
+Gemini model (configurable latency and 429 share), a simulated browser
+session and a local dashboard stub, then fires /start_campaign for every
+campaign and answers each draft with /campaign_action like an operator
+would. Reports per-endpoint latency percentiles, contact throughput,
+process memory and what the dashboard received.
+
+    python loadtest/run_load.py --campaigns 200 --contacts 3 --rate-limit-ratio 0.05
+"""
+import os
+import sys
+import json
+import time
+import socket
+import logging
+import argparse
+import tempfile
+import threading
+import tracemalloc
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import psutil
+import requests
+from werkzeug.serving import make_server
+
+from fakes import OfflineAutomation, fake_model_factory
+from dashboard_stub import DashboardStub
+
+import gemini_client
+from browser_pool import BrowserPool
+from log_pipeline import configure_logging
+
+logger = logging.getLogger(__name__)
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _percentiles(samples):
+    ordered = sorted(samples)
+    if not ordered:
+        return {'count': 0}
+
+    def pct(p):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1000, 1)
+
+    return {'count': len(ordered), 'p50_ms': pct(50), 'p90_ms': pct(90), 'p99_ms': pct(99), 'max_ms': pct(100)}
+
+
+class LoadDriver:
+    def __init__(self, base_url, concurrency):
+        self.base_url = base_url
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount('http://', adapter)
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def call(self, name, method, path, payload=None):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, f"{self.base_url}{path}", json=payload, timeout=30)
+            ok = response.status_code == 200
+            body = response.json()
+        except Exception:
+            ok, body = False, {}
+        with self._lock:
+            self.latencies[name].append(time.perf_counter() - started)
+            if not ok:
+                self.errors[name] += 1
+        return body
+
+    def start_campaign(self, campaign_id, contacts):
+        return self.call('start_campaign', 'POST', '/start_campaign', {
+            'campaign_id': campaign_id,
+            'user_config': {},
+            'campaign_data': {'contacts': contacts, 'max_contacts': len(contacts)}
+        })
+
+    def operate(self, campaign_id, action, poll_interval, deadline):
+        """Play the operator for one campaign until it finishes; returns its final status"""
+        answered = set()
+        while time.monotonic() < deadline:
+            status = self.call('campaign_status', 'GET', f'/campaign_status/{campaign_id}')
+            if status.get('status') in ('completed', 'failed', 'stopped'):
+                return status.get('status')
+            contact = status.get('current_contact') or {}
+            if status.get('awaiting_confirmation') and contact.get('contact_index') not in answered:
+                answered.add(contact.get('contact_index'))
+                self.call('campaign_action', 'POST', '/campaign_action', {
+                    'campaign_id': campaign_id,
+                    'action': action,
+                    'contact_index': contact.get('contact_index')
+                })
+            time.sleep(poll_interval)
+        return 'timeout'
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline load test for the client Flask API")
+    parser.add_argument('--campaigns', type=int, default=200)
+    parser.add_argument('--contacts', type=int, default=3, help="contacts per campaign")
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--action', choices=['send', 'skip'], default='send')
+    parser.add_argument('--model-latency', type=float, default=0.3)
+    parser.add_argument('--rate-limit-ratio', type=float, default=0.0, help="share of Gemini calls answered with a 429")
+    parser.add_argument('--requests-per-minute', type=int, default=600, help="client-side Gemini rate limit")
+    parser.add_argument('--dashboard-fail-ratio', type=float, default=0.0)
+    parser.add_argument('--timeout', type=float, default=600)
+    parser.add_argument('--json', help="write the report to this file")
+    parser.add_argument('--verbose', action='store_true')
+    args = parser.parse_args()
+
+    report_path = os.path.abspath(args.json) if args.json else None
+    workdir = tempfile.mkdtemp(prefix="client_load_")
+    os.chdir(workdir)
+
+    stub = DashboardStub(fail_ratio=args.dashboard_fail_ratio).start()
+    factory = fake_model_factory(latency=args.model_latency, rate_limit_ratio=args.rate_limit_ratio)
+    gemini_client.set_model_factory(factory)
+
+    with open('client_config.json', 'w', encoding='utf-8') as f:
+        json.dump({
+            'linkedin_email': 'load@example.com',
+            'linkedin_password': 'unused',
+            'gemini_api_key': 'fake-key',
+            'dashboard_url': stub.url,
+            'local_port': _free_port(),
+            'gemini_requests_per_minute': args.requests_per_minute,
+            'connection_delay_range': [0, 0],
+            'progress_report_window': 0.5
+        }, f)
+
+    configure_logging('client_automation.jsonl', level=logging.INFO, console_level=None if args.verbose else logging.WARNING)
+    # Imported here so its stores land in the scratch directory
+    import client_bot
+
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+    tracemalloc.start()
+
+    client = client_bot.EnhancedLinkedInAutomationClient()
+    client.browser_pool = BrowserPool(max_jobs=10 ** 6, factory=OfflineAutomation)
+    server = make_server('127.0.0.1', client.config['local_port'], client.flask_app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="client-api", daemon=True).start()
+
+    driver = LoadDriver(f"http://127.0.0.1:{client.config['local_port']}", args.concurrency)
+    campaigns = {
+        f"load-{n:04d}": [
+            {
+                'Name': f"Contact {n}-{i}",
+                'Company': "Northwind",
+                'Role': "Engineering Manager",
+                'LinkedIn_profile': f"https://www.linkedin.com/in/load-contact-{n}-{i}",
+                'services and products_1': "data platform consulting"
+            }
+            for i in range(args.contacts)
+        ]
+        for n in range(args.campaigns)
+    }
+
+    started = time.monotonic()
+    deadline = started + args.timeout
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(lambda item: driver.start_campaign(*item), campaigns.items()))
+        outcomes = list(pool.map(
+            lambda campaign_id: driver.operate(campaign_id, args.action, 0.05, deadline), campaigns
+        ))
+    elapsed = time.monotonic() - started
+
+    client.reporter.flush(timeout=30)
+    _, traced_peak = tracemalloc.get_traced_memory()
+    rss_after = process.memory_info().rss
+    models = list(factory.models.values())
+
+    report = {
+        'campaigns': args.campaigns,
+        'contacts': args.campaigns * args.contacts,
+        'elapsed_s': round(elapsed, 2),
+        'contacts_per_s': round(args.campaigns * args.contacts / elapsed, 2),
+        'outcomes': {outcome: outcomes.count(outcome) for outcome in set(outcomes)},
+        'endpoints': {name: _percentiles(samples) for name, samples in driver.latencies.items()},
+        'errors': dict(driver.errors),
+        'memory': {
+            'rss_before_mb': round(rss_before / 2 ** 20, 1),
+            'rss_after_mb': round(rss_after / 2 ** 20, 1),
+            'python_peak_mb': round(traced_peak / 2 ** 20, 1)
+        },
+        'gemini': {
+            'calls': sum(model.calls for model in models),
+            'rate_limited': sum(model.rate_limited for model in models),
+            'client': gemini_client.gemini_metrics()
+        },
+        'dashboard': stub.counts(),
+        'workdir': workdir
+    }
+
+    server.shutdown()
+    client.cleanup()
+    stub.stop()
+
+    print(json.dumps(report, indent=2))
+    if report_path:
+        with open(report_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return 0 if report['outcomes'].get('completed') == args.campaigns else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,172 @@
+import os
+import sys
+import copy
+import json
+import queue
+import atexit
+import logging
+import threading
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+# Campaign / correlation IDs of the job running on the current thread (or context)
+_log_context = contextvars.ContextVar('log_context', default={})
+
+CONSOLE_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach fields (campaign_id, correlation_id, ...) to every record logged inside the block"""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+def current_log_context():
+    return dict(_log_context.get())
+
+
+class ContextFilter(logging.Filter):
+    """Copies the current log context onto the record; runs on the calling thread, before the queue"""
+
+    def filter(self, record):
+        for key, value in _log_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, thread, message, context fields and exception"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'msg': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler that keeps the traceback in its own field: the stock
+    prepare() folds it into `msg`, so the JSON lines never got an `exc`.
+    """
+
+    _formatter = logging.Formatter()
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # Tracebacks don't pickle or outlive their frames; keep the text only
+            record.exc_text = record.exc_text or self._formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class SizeAndTimeRotatingFileHandler(TimedRotatingFileHandler):
+    """Rotates on the `when` schedule and also whenever the file would grow past `max_bytes`"""
+
+    def __init__(self, filename, max_bytes=20 * 1024 * 1024, when='midnight', backup_count=7, encoding='utf-8'):
+        super().__init__(filename, when=when, backupCount=backup_count, encoding=encoding, delay=True)
+        self.max_bytes = max_bytes
+
+    def shouldRollover(self, record):
+        if super().shouldRollover(record):
+            return True
+        if self.max_bytes and self.stream is not None:
+            self.stream.seek(0, os.SEEK_END)
+            return self.stream.tell() + len(self.format(record)) + 1 >= self.max_bytes
+        return False
+
+    def rotation_filename(self, default_name):
+        # Size rollovers can happen several times per period; never overwrite an earlier one
+        name = super().rotation_filename(default_name)
+        candidate, index = name, 1
+        while os.path.exists(candidate):
+            candidate, index = f"{name}.{index}", index + 1
+        return candidate
+
+
+_listener = None
+_setup_lock = threading.Lock()
+
+
+def configure_logging(log_file='client_automation.jsonl', level=logging.INFO, console=True,
+                      console_level=None, max_bytes=20 * 1024 * 1024, when='midnight', backup_count=7):
+    """
+    Route all logging through a queue so callers never wait on disk or console I/O.
+
+    The root logger gets a single QueueHandler; a QueueListener thread writes
+    JSON lines to a size- and time-rotated `log_file` and the familiar text
+    format to stdout. Safe to call more than once; only the first call
+    installs the pipeline. Returns the listener.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return _listener
+
+        log_queue = queue.Queue(-1)
+        handlers = []
+
+        file_handler = SizeAndTimeRotatingFileHandler(
+            log_file, max_bytes=max_bytes, when=when, backup_count=backup_count
+        )
+        file_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(file_handler)
+
+        if console:
+            stream = sys.stdout
+            if hasattr(stream, 'reconfigure'):
+                try:
+                    stream.reconfigure(errors='replace')  # emoji on legacy Windows consoles
+                except Exception:
+                    pass
+            console_handler = logging.StreamHandler(stream)
+            console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            console_handler.setLevel(console_level or level)
+            handlers.append(console_handler)
+
+        queue_handler = StructuredQueueHandler(log_queue)
+        queue_handler.addFilter(ContextFilter())
+
+        root = logging.getLogger()
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(queue_handler)
+        root.setLevel(level)
+
+        _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+        return _listener
+
+
+def shutdown_logging():
+    """Flush everything still queued and stop the listener thread"""
+    global _listener
+    with _setup_lock:
+        listener, _listener = _listener, None
+    if listener is not None:
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
@@ -0,0 +1,143 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+import atexit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_FILE = 'message_cache.db'
+DEFAULT_TTL = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 5000
+
+
+def prompt_key(prompt, namespace=""):
+    """Content address of a fully rendered prompt (plus model / template version namespace)"""
+    return hashlib.sha256(f"{namespace}\x00{prompt}".encode('utf-8')).hexdigest()
+
+
+class MessageCache:
+    """
+    On-disk cache of AI-generated messages keyed by a hash of the rendered
+    prompt. Entries expire after `ttl` seconds and the least recently used
+    ones are evicted once there are more than `max_entries`.
+    """
+
+    def __init__(self, db_file=DEFAULT_CACHE_FILE, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.db_file = db_file
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS message_cache ("
+            " prompt_hash TEXT PRIMARY KEY,"
+            " message TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " last_used_at REAL NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS message_cache_last_used ON message_cache (last_used_at)"
+        )
+        self._conn.commit()
+        self.purge()
+
+    def get(self, prompt, namespace=""):
+        """Return the cached message for this prompt, or None"""
+        key = prompt_key(prompt, namespace)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT message, created_at FROM message_cache WHERE prompt_hash = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] >= self.ttl:
+                if row is not None:
+                    self._conn.execute("DELETE FROM message_cache WHERE prompt_hash = ?", (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE message_cache SET last_used_at = ? WHERE prompt_hash = ?", (now, key)
+            )
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, prompt, message, namespace=""):
+        """Store a generated message and evict the least recently used entries over the limit"""
+        key = prompt_key(prompt, namespace)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO message_cache (prompt_hash, message, created_at, last_used_at)"
+                " VALUES (?, ?, ?, ?)",
+                (key, message, now, now)
+            )
+            overflow = self._conn.execute("SELECT COUNT(*) FROM message_cache").fetchone()[0] - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM message_cache WHERE prompt_hash IN ("
+                    " SELECT prompt_hash FROM message_cache ORDER BY last_used_at LIMIT ?)",
+                    (overflow,)
+                )
+            self._conn.commit()
+
+    def purge(self):
+        """Drop expired entries"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM message_cache WHERE created_at <= ?", (time.time() - self.ttl,)
+            )
+            self._conn.commit()
+        if cursor.rowcount:
+            logger.info(f"🧹 Purged {cursor.rowcount} expired cached messages")
+        return cursor.rowcount
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM message_cache").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.ProgrammingError:
+                pass
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_message_cache(db_file=DEFAULT_CACHE_FILE, ttl=None, max_entries=None):
+    """
+    Return the process-wide cache for `db_file`, opening it on first use.
+
+    `ttl` / `max_entries` left as None take the open cache's settings (or
+    the defaults); asking for different ones than it was opened with
+    raises ValueError instead of being silently ignored.
+    """
+    key = os.path.abspath(db_file)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = MessageCache(
+                db_file,
+                DEFAULT_TTL if ttl is None else ttl,
+                DEFAULT_MAX_ENTRIES if max_entries is None else max_entries
+            )
+            _caches[key] = cache
+            atexit.register(cache.close)
+        elif (ttl is not None and ttl != cache.ttl) or (max_entries is not None and max_entries != cache.max_entries):
+            raise ValueError(
+                f"Message cache {db_file} is already open with ttl={cache.ttl}, max_entries={cache.max_entries}"
+            )
+        return cache
@@ -0,0 +1,126 @@
+import time
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Elements whose presence means a page type has rendered enough to work with.
+# Some include the "you ended up somewhere else" outcome (login form, no results)
+# so callers find out immediately instead of at the timeout.
+PAGE_SENTINELS = {
+    'feed': [
+        "div.feed-identity-module", "main.scaffold-layout__main", "#global-nav",
+        "#username", "form.login__form", "div.authwall-join-form"
+    ],
+    'profile': [
+        "h1.text-heading-xlarge", "main h1", ".pv-text-details__left-panel",
+        "div.profile-unavailable", "#username"
+    ],
+    'search_results': [
+        "div.search-results-container ul li", "ul.reusable-search__entity-result-list",
+        "div.search-reusables__no-results", "div.search-no-results"
+    ],
+    'messaging': [
+        "ul.msg-conversations-container__conversations-list", "div.msg-threads",
+        "div.msg-conversations-container"
+    ],
+}
+
+# An element of the current results list; it is detached when the next page renders
+SEARCH_RESULTS_MARKER = "div.search-results-container ul li, ul.reusable-search__entity-result-list li"
+
+_READY_SCRIPT = """
+if (document.readyState !== 'complete') { return false; }
+var selectors = arguments[0];
+for (var i = 0; i < selectors.length; i++) {
+    if (document.querySelector(selectors[i])) { return true; }
+}
+return selectors.length === 0;
+"""
+
+_CHANGED_SCRIPT = """
+var marker = arguments[0];
+if (marker && !marker.isConnected) { return true; }
+return window.location.href !== arguments[1];
+"""
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def wait_until_ready(driver, page_type, timeout=15, sentinels=None, poll_frequency=0.2):
+    """
+    Block until the current page is loaded (document.readyState) and shows
+    one of the page type's sentinel elements, checked in a single script
+    call per poll. Returns False on timeout. Every wait is recorded per
+    page type, see wait_stats().
+    """
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException
+
+    selectors = list(sentinels if sentinels is not None else PAGE_SENTINELS.get(page_type, []))
+    started = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(
+            lambda d: d.execute_script(_READY_SCRIPT, selectors)
+        )
+        ready = True
+    except TimeoutException:
+        logger.warning(f"⚠️ {page_type} page not ready after {timeout}s - proceeding anyway")
+        ready = False
+    _record(page_type, time.monotonic() - started, ready)
+    return ready
+
+
+def wait_until_replaced(driver, page_type, marker=None, old_url=None, timeout=15, poll_frequency=0.2):
+    """
+    Like wait_until_ready() for client-side navigations (pagination), where
+    the old page is already complete and already shows the sentinels: first
+    block until `marker`, an element of the old page, is detached or the URL
+    has moved off `old_url`, then until the new page is ready. Returns False
+    on timeout.
+    """
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+
+    def _changed(d):
+        try:
+            return d.execute_script(_CHANGED_SCRIPT, marker, old_url)
+        except StaleElementReferenceException:
+            return True
+
+    started = time.monotonic()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(_changed)
+    except TimeoutException:
+        logger.warning(f"⚠️ {page_type} page did not change after {timeout}s")
+        _record(page_type, time.monotonic() - started, False)
+        return False
+    return wait_until_ready(driver, page_type, max(0.5, timeout - (time.monotonic() - started)),
+                            poll_frequency=poll_frequency)
+
+
+def _record(page_type, elapsed, ready):
+    with _stats_lock:
+        stats = _stats.setdefault(page_type, {'count': 0, 'timeouts': 0, 'total': 0.0, 'max': 0.0, 'last': 0.0})
+        stats['count'] += 1
+        stats['total'] += elapsed
+        stats['max'] = max(stats['max'], elapsed)
+        stats['last'] = elapsed
+        if not ready:
+            stats['timeouts'] += 1
+
+
+def wait_stats():
+    """Observed page-readiness waits per page type (seconds)"""
+    with _stats_lock:
+        return {
+            page_type: {
+                'count': stats['count'],
+                'timeouts': stats['timeouts'],
+                'avg': round(stats['total'] / stats['count'], 3),
+                'max': round(stats['max'], 3),
+                'last': round(stats['last'], 3)
+            }
+            for page_type, stats in _stats.items()
+        }
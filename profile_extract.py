@@ -0,0 +1,62 @@
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Fallback selectors per field, tried in order inside the page
+PROFILE_SELECTORS = {
+    'name': [
+        "h1.text-heading-xlarge",
+        ".pv-text-details__left-panel h1",
+        "[data-test-id='profile-name'] h1",
+        ".ph5 h1"
+    ],
+    'headline': [
+        ".text-body-medium.break-words",
+        ".pv-text-details__left-panel .text-body-medium",
+        "[data-test-id='profile-headline']"
+    ],
+    'about': [
+        "[data-test-id='about-section'] .pv-shared-text-with-see-more span[aria-hidden='true']",
+        ".pv-about-section .pv-shared-text-with-see-more span"
+    ],
+}
+
+_EXTRACT_SCRIPT = """
+var selectors = arguments[0];
+function firstText(candidates, reject) {
+    for (var i = 0; i < candidates.length; i++) {
+        var el = document.querySelector(candidates[i]);
+        if (!el) { continue; }
+        var text = (el.innerText || el.textContent || '').trim();
+        if (text && text !== reject) { return text; }
+    }
+    return '';
+}
+var name = firstText(selectors.name, null);
+return {
+    name: name,
+    headline: firstText(selectors.headline, name),
+    about: firstText(selectors.about, null)
+};
+"""
+
+
+def extract_profile(driver, selectors=PROFILE_SELECTORS):
+    """Read name, headline and about snippet from the open profile page in one execute_script round trip"""
+    started = time.monotonic()
+    data = driver.execute_script(_EXTRACT_SCRIPT, selectors) or {}
+
+    profile_data = {'extracted_name': data.get('name') or "Professional", 'about_snippet': ""}
+    if data.get('name'):
+        logger.info(f"📝 Extracted name: {profile_data['extracted_name']}")
+    if data.get('headline'):
+        profile_data['extracted_headline'] = data['headline']
+        logger.info(f"💼 Extracted headline: {data['headline'][:50]}...")
+    about_text = data.get('about') or ""
+    if about_text:
+        profile_data['about_snippet'] = about_text[:150] + "..." if len(about_text) > 150 else about_text
+        logger.info(f"📄 Extracted about: {profile_data['about_snippet'][:50]}...")
+
+    logger.debug(f"Profile extracted in {(time.monotonic() - started) * 1000:.0f}ms")
+    return profile_data
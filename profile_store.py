@@ -0,0 +1,289 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+import logging
+import atexit
+import hashlib
+import bisect
+from array import array
+from datetime import datetime
+from urllib.parse import urlparse, unquote
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_FILE = 'messaged_profiles.db'
+LEGACY_JSON_FILE = 'messaged_profiles.json'
+
+# Bump whenever normalize_profile_url() changes so stored keys get rebuilt
+KEY_VERSION = '3'
+
+
+def _linkedin_path_parts(profile_url):
+    """Non-empty path segments of a linkedin.com URL (None for other hosts)"""
+    url = profile_url.strip()
+    if "://" not in url:
+        url = "https://" + url.lstrip('/')
+    parsed = urlparse(url)
+    host = parsed.netloc.lower().split(':')[0]
+    if host != "linkedin.com" and not host.endswith(".linkedin.com"):
+        return None
+    return [p for p in parsed.path.split('/') if p]
+
+
+def canonical_profile_slug(profile_url):
+    """Return the lowercase public-profile slug ("nshukla") of a LinkedIn /in/ URL, or "" if there is none"""
+    if not profile_url:
+        return ""
+    parts = _linkedin_path_parts(profile_url)
+    if parts and len(parts) >= 2 and parts[0].lower() == "in":
+        return unquote(parts[1]).strip().lower()
+    return ""
+
+
+def normalize_profile_url(profile_url):
+    """
+    Reduce a profile URL to its canonical form, e.g. https://www.linkedin.com/in/nshukla.
+
+    Legacy /pub/<name>/<a>/<b>/<c> URLs keep their whole path: the name
+    part alone is shared by different people.
+    """
+    slug = canonical_profile_slug(profile_url)
+    if slug:
+        return f"https://www.linkedin.com/in/{slug}"
+    if not profile_url or not profile_url.strip():
+        return ""
+    parts = _linkedin_path_parts(profile_url)
+    if parts and len(parts) >= 2 and parts[0].lower() == "pub":
+        return "https://www.linkedin.com/pub/" + "/".join(unquote(p).strip().lower() for p in parts[1:])
+    # Not a recognisable profile URL - fall back to a scheme/query-insensitive key
+    url = profile_url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return f"{host}{parsed.path.rstrip('/').lower()}"
+
+
+def profile_hash(profile_url):
+    """64-bit hash of the canonical profile URL"""
+    url_key = normalize_profile_url(profile_url)
+    if not url_key:
+        return 0
+    return url_key_hash(url_key)
+
+
+def url_key_hash(url_key):
+    """64-bit hash of an already-normalized profile URL"""
+    return int.from_bytes(hashlib.blake2b(url_key.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+class ProfileHashIndex:
+    """Compact membership index of 64-bit profile hashes (8 bytes per entry once merged)"""
+
+    def __init__(self, hashes=(), merge_threshold=4096):
+        self._sorted = array('Q', sorted(set(hashes)))
+        self._recent = set()
+        self.merge_threshold = merge_threshold
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sorted) + len(self._recent)
+
+    def __contains__(self, value):
+        with self._lock:
+            if value in self._recent:
+                return True
+            i = bisect.bisect_left(self._sorted, value)
+            return i < len(self._sorted) and self._sorted[i] == value
+
+    def add(self, value):
+        with self._lock:
+            self._recent.add(value)
+            if len(self._recent) >= self.merge_threshold:
+                self._sorted = array('Q', sorted(set(self._sorted).union(self._recent)))
+                self._recent = set()
+
+    def as_array(self):
+        """All hashes as a sorted array('Q'), e.g. for numpy.isin()"""
+        with self._lock:
+            if self._recent:
+                self._sorted = array('Q', sorted(set(self._sorted).union(self._recent)))
+                self._recent = set()
+            return self._sorted
+
+
+class TrackedProfileStore:
+    """SQLite (WAL) store of already-contacted profiles, shared by every campaign thread"""
+
+    def __init__(self, db_file=DEFAULT_DB_FILE, legacy_json_file=LEGACY_JSON_FILE,
+                 batch_size=20, commit_interval=5.0):
+        self.db_file = db_file
+        self.legacy_json_file = legacy_json_file
+        self.batch_size = batch_size
+        self.commit_interval = commit_interval
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+        self._conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS messaged_profiles ("
+            " url_key TEXT PRIMARY KEY,"
+            " profile_url TEXT NOT NULL,"
+            " messaged_at TEXT NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT)"
+        )
+        self._conn.commit()
+
+        self._rekey_if_needed()
+        self._migrate_legacy_json()
+        self._index = ProfileHashIndex(
+            url_key_hash(row[0]) for row in self._conn.execute("SELECT url_key FROM messaged_profiles")
+        )
+        logger.info(f"✅ Tracked profile store ready ({self.count()} profiles) at {db_file}")
+
+    def _rekey_if_needed(self):
+        """Rebuild url_key for rows written with an older normalize_profile_url()"""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM store_meta WHERE key = 'key_version'").fetchone()
+            if row and row[0] == KEY_VERSION:
+                return
+            rows = self._conn.execute(
+                "SELECT profile_url, messaged_at FROM messaged_profiles ORDER BY messaged_at"
+            ).fetchall()
+            self._conn.execute("DELETE FROM messaged_profiles")
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO messaged_profiles (url_key, profile_url, messaged_at) VALUES (?, ?, ?)",
+                [(normalize_profile_url(url), url, at) for url, at in rows if normalize_profile_url(url)]
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('key_version', ?)", (KEY_VERSION,)
+            )
+            self._conn.commit()
+            if rows:
+                logger.info(f"🔑 Re-keyed {len(rows)} tracked profiles to canonical URLs")
+
+    def _migrate_legacy_json(self):
+        """One-time import of the old messaged_profiles.json list"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM store_meta WHERE key = 'legacy_json_migrated'"
+            ).fetchone()
+            if row or not self.legacy_json_file or not os.path.exists(self.legacy_json_file):
+                return
+
+            try:
+                with open(self.legacy_json_file, 'r', encoding='utf-8') as f:
+                    urls = json.load(f)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not read legacy tracked profiles: {e}")
+                return
+
+            now = datetime.now().isoformat()
+            rows = [(normalize_profile_url(u), u, now) for u in urls if normalize_profile_url(u)]
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO messaged_profiles (url_key, profile_url, messaged_at) VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES ('legacy_json_migrated', ?)",
+                (now,)
+            )
+            self._conn.commit()
+            logger.info(f"📦 Migrated {len(rows)} profiles from {self.legacy_json_file}")
+
+    def contains(self, profile_url):
+        """Check whether a profile has already been contacted"""
+        url_key = normalize_profile_url(profile_url)
+        if not url_key:
+            return False
+        # Every stored key is in the in-memory hash index, so a miss there is definitive
+        if url_key_hash(url_key) not in self._index:
+            return False
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM messaged_profiles WHERE url_key = ?", (url_key,)
+            ).fetchone()
+        return row is not None
+
+    def add(self, profile_url):
+        """Record a contacted profile; the write is committed in batches"""
+        url_key = normalize_profile_url(profile_url)
+        if not url_key:
+            return False
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO messaged_profiles (url_key, profile_url, messaged_at) VALUES (?, ?, ?)",
+                (url_key, profile_url, datetime.now().isoformat())
+            )
+            self._index.add(url_key_hash(url_key))
+            self._pending += cursor.rowcount
+            if (self._pending >= self.batch_size or
+                    time.monotonic() - self._last_commit >= self.commit_interval):
+                self._commit_locked()
+        return cursor.rowcount > 0
+
+    def hash_index(self):
+        """Snapshot of the stored profile hashes, for bulk membership checks off the DB"""
+        with self._lock:
+            return ProfileHashIndex(
+                url_key_hash(row[0]) for row in self._conn.execute("SELECT url_key FROM messaged_profiles")
+            )
+
+    def flush(self):
+        """Commit any batched inserts"""
+        with self._lock:
+            self._commit_locked()
+
+    def _commit_locked(self):
+        if self._pending:
+            self._conn.commit()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def count(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM messaged_profiles").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            try:
+                self._commit_locked()
+                self._conn.close()
+            except sqlite3.ProgrammingError:
+                pass
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_tracked_store(db_file=DEFAULT_DB_FILE, legacy_json_file=None):
+    """
+    Return the process-wide store for `db_file`, opening it on first use.
+
+    `legacy_json_file` left as None takes the open store's setting (or the
+    default); a different one than it was opened with raises ValueError
+    instead of being silently ignored.
+    """
+    key = os.path.abspath(db_file)
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = TrackedProfileStore(db_file, LEGACY_JSON_FILE if legacy_json_file is None else legacy_json_file)
+            _stores[key] = store
+            atexit.register(store.close)
+        elif legacy_json_file is not None and legacy_json_file != store.legacy_json_file:
+            raise ValueError(
+                f"Tracked profile store {db_file} is already open with legacy_json_file={store.legacy_json_file}"
+            )
+        return store
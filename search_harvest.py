@@ -0,0 +1,105 @@
+import time
+import logging
+
+from profile_store import normalize_profile_url
+
+logger = logging.getLogger(__name__)
+
+# Containers LinkedIn has used for one person in the people-search results
+CARD_SELECTORS = [
+    "li.reusable-search__result-container",
+    "div.entity-result",
+    "div.search-result__info",
+    "div[data-chameleon-result-urn]"
+]
+
+_HARVEST_SCRIPT = """
+var cardSelectors = arguments[0];
+var seen = [];
+var cards = [];
+function addCard(el) {
+    if (!el || seen.indexOf(el) !== -1) { return; }
+    for (var i = 0; i < seen.length; i++) {
+        if (seen[i].contains(el)) { return; }
+    }
+    seen.push(el);
+    cards.push(el);
+}
+document.querySelectorAll(cardSelectors.join(',')).forEach(addCard);
+// Connect buttons outside any known card layout still count, grouped by their list item
+document.querySelectorAll('button').forEach(function (b) {
+    var label = (b.getAttribute('aria-label') || '') + ' ' + (b.innerText || '');
+    if (label.indexOf('Connect') !== -1) { addCard(b.closest('li') || b.parentElement); }
+});
+
+function text(el) { return el ? (el.innerText || el.textContent || '').trim() : ''; }
+function visible(el) { return !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length); }
+function buttonState(b) {
+    var label = ((b.getAttribute('aria-label') || '') + ' ' + text(b)).toLowerCase();
+    var disabled = b.disabled || b.className.indexOf('disabled') !== -1;
+    if (label.indexOf('pending') !== -1) { return 'pending'; }
+    if (label.indexOf('connect') !== -1) { return disabled || !visible(b) ? 'unavailable' : 'connect'; }
+    if (label.indexOf('message') !== -1) { return 'message'; }
+    if (label.indexOf('follow') !== -1) { return 'follow'; }
+    return null;
+}
+
+window.__harvestSeq = window.__harvestSeq || 0;
+return cards.map(function (card) {
+    if (!card.dataset.harvestId) { card.dataset.harvestId = String(++window.__harvestSeq); }
+    var link = card.querySelector("a[href*='/in/']");
+    var nameEl = card.querySelector(".entity-result__title-text a span[aria-hidden='true']")
+        || card.querySelector(".search-result__result-link")
+        || card.querySelector("[aria-hidden='true']");
+    var headlineEl = card.querySelector(".entity-result__primary-subtitle")
+        || card.querySelector(".subline-level-1");
+    var button = null, state = null;
+    var buttons = card.querySelectorAll('button');
+    for (var i = 0; i < buttons.length; i++) {
+        var s = buttonState(buttons[i]);
+        if (s && (state === null || s === 'connect')) { button = buttons[i]; state = s; }
+        if (state === 'connect') { break; }
+    }
+    return {
+        handle: card.dataset.harvestId,
+        url: link ? link.href : '',
+        name: text(nameEl),
+        headline: text(headlineEl),
+        state: state,
+        button: button
+    };
+});
+"""
+
+
+def harvest_search_results(driver, card_selectors=CARD_SELECTORS):
+    """
+    Read every result card on the current search page in one execute_script
+    round trip: profile URL, name, headline, the state of its action button
+    ('connect', 'pending', 'message', 'follow', 'unavailable' or None), the
+    button element itself and a `handle` that stays stable for the card
+    while the page is open.
+    """
+    started = time.monotonic()
+    cards = []
+    for card in driver.execute_script(_HARVEST_SCRIPT, card_selectors) or []:
+        cards.append({
+            'handle': card.get('handle'),
+            'profile_url': normalize_profile_url(card.get('url') or ""),
+            'name': card.get('name') or "Professional",
+            'headline': card.get('headline') or "",
+            'button_state': card.get('state'),
+            'button': card.get('button')
+        })
+    logger.debug(f"Harvested {len(cards)} result cards in {(time.monotonic() - started) * 1000:.0f}ms")
+    return cards
+
+
+def connectable(cards):
+    """Cards that still show an enabled, visible Connect button"""
+    return [card for card in cards if card['button_state'] == 'connect' and card['button'] is not None]
+
+
+def card_summary(card):
+    """JSON-safe view of a harvested card (without the button element)"""
+    return {key: value for key, value in card.items() if key != 'button'}
@@ -0,0 +1,145 @@
+import os
+import json
+import time
+import atexit
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATS_FILE = 'selector_stats.json'
+
+
+def _selector_key(selector_type, selector):
+    return f"{selector_type}:{selector}"
+
+
+class SelectorStats:
+    """
+    Hit / miss / latency record for every (type, selector) candidate,
+    persisted to JSON between runs. order() puts the candidates that have
+    been finding elements first.
+    """
+
+    def __init__(self, path=DEFAULT_STATS_FILE, save_every=20):
+        self.path = path
+        self.save_every = save_every
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self._stats = {}
+        try:
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._stats = json.load(f)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not load selector stats: {e}")
+
+    def _score(self, selectors_with_index):
+        index, (selector_type, selector) = selectors_with_index
+        stats = self._stats.get(_selector_key(selector_type, selector))
+        if not stats:
+            return (-0.5, 0.0, index)  # unknown: neutral hit rate, keep the written order
+        hit_rate = (stats['hits'] + 1) / (stats['hits'] + stats['misses'] + 2)
+        avg_latency = stats['latency'] / stats['hits'] if stats['hits'] else float('inf')
+        return (-hit_rate, avg_latency, index)
+
+    def order(self, selectors):
+        """Candidates sorted by smoothed hit rate, then average latency, then their written order"""
+        with self._lock:
+            return [selector for _, selector in sorted(enumerate(selectors), key=self._score)]
+
+    def record(self, tried, winner=None, latency=0.0):
+        """`winner` found the element after `latency` seconds; every other candidate in `tried` ahead of it missed"""
+        with self._lock:
+            for candidate in tried:
+                if candidate == winner:
+                    stats = self._stats.setdefault(_selector_key(*candidate), {'hits': 0, 'misses': 0, 'latency': 0.0})
+                    stats['hits'] += 1
+                    stats['latency'] += latency
+                    break
+                stats = self._stats.setdefault(_selector_key(*candidate), {'hits': 0, 'misses': 0, 'latency': 0.0})
+                stats['misses'] += 1
+            self._dirty += 1
+            due = self._dirty >= self.save_every
+        if due:
+            self.save()
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps(self._stats, indent=2)
+            self._dirty = 0
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.debug(f"Could not save selector stats: {e}")
+
+    def snapshot(self):
+        with self._lock:
+            return {key: dict(stats) for key, stats in self._stats.items()}
+
+
+_stats = None
+_stats_lock = threading.Lock()
+
+
+def get_selector_stats(path=DEFAULT_STATS_FILE):
+    """Process-wide selector statistics, loaded on first use and saved at exit"""
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = SelectorStats(path)
+            atexit.register(_stats.save)
+        return _stats
+
+
+def find_first(driver, selectors, timeout=10, clickable=True, stats=None, reorder=False):
+    """
+    Race all (type, selector) candidates in one wait and return the first
+    element found (None on timeout).
+
+    Each poll checks every candidate, so a stale selector no longer costs a
+    full timeout before the working one is tried. Candidates are checked in
+    their written order, which is a priority: a generic fallback must never
+    win over a specific selector that also matches. Only lists whose
+    candidates are interchangeable should pass reorder=True to check them
+    best-first by recorded hit rate.
+    """
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import (
+        TimeoutException,
+        NoSuchElementException,
+        StaleElementReferenceException
+    )
+
+    stats = stats or get_selector_stats()
+    ordered = stats.order(selectors) if reorder else list(selectors)
+    matched = []
+
+    def _any_candidate(d):
+        for selector_type, selector in ordered:
+            locator = (By.XPATH if selector_type == "xpath" else By.CSS_SELECTOR, selector)
+            condition = EC.element_to_be_clickable(locator) if clickable else EC.presence_of_element_located(locator)
+            try:
+                element = condition(d)
+            except (NoSuchElementException, StaleElementReferenceException):
+                element = None
+            if element:
+                matched.append((selector_type, selector))
+                return element
+        return False
+
+    started = time.monotonic()
+    try:
+        element = WebDriverWait(driver, timeout, poll_frequency=0.25).until(_any_candidate)
+    except TimeoutException:
+        stats.record(ordered)
+        return None
+    stats.record(ordered, matched[-1], time.monotonic() - started)
+    return element
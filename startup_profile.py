@@ -0,0 +1,117 @@
+import os
+import sys
+import time
+import builtins
+import logging
+import threading
+import importlib.util
+
+logger = logging.getLogger(__name__)
+
+ENV_FLAG = 'CLIENT_STARTUP_PROFILE'
+ARGV_FLAG = '--profile-startup'
+
+# Everything is measured from the moment this module is imported (first thing client_bot does)
+_origin = time.perf_counter()
+_marks = {}
+_profiler = None
+
+
+class ImportProfiler:
+    """
+    Times first-time imports made on the main thread, like `python -X importtime`
+    but available inside the frozen executable: `self` excludes nested
+    imports, `cumulative` includes them.
+    """
+
+    def __init__(self):
+        self.records = []  # (module, self_s, cumulative_s, depth)
+        self._children = []
+        self._original = None
+        self._main = threading.main_thread()
+
+    def install(self):
+        self._original = builtins.__import__
+        builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original is not None and builtins.__import__ is self._import:
+            builtins.__import__ = self._original
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if threading.current_thread() is not self._main:
+            return self._original(name, globals, locals, fromlist, level)
+        module = _resolve(name, globals, level)
+        if module is None or module in sys.modules:
+            return self._original(name, globals, locals, fromlist, level)
+
+        self._children.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = self._children.pop()
+            if self._children:
+                self._children[-1] += elapsed
+            self.records.append((module, elapsed - nested, elapsed, len(self._children)))
+
+
+def _resolve(name, globals, level):
+    if level == 0:
+        return name
+    try:
+        package = (globals or {}).get('__package__') or (globals or {}).get('__name__', '')
+        return importlib.util.resolve_name('.' * level + name, package)
+    except Exception:
+        return None
+
+
+def enabled():
+    return os.environ.get(ENV_FLAG, '') not in ('', '0') or ARGV_FLAG in sys.argv
+
+
+def start():
+    """Begin timing imports if profiling was asked for (--profile-startup or CLIENT_STARTUP_PROFILE=1)"""
+    global _profiler
+    if _profiler is None and enabled():
+        _profiler = ImportProfiler()
+        _profiler.install()
+
+
+def mark(label):
+    """Remember when a startup milestone (first GUI window, ...) was reached"""
+    _marks.setdefault(label, time.perf_counter() - _origin)
+
+
+def report(path='startup_profile.txt', top=20):
+    """
+    Log the startup milestones; when profiling, also the slowest imports, and
+    write the full import list (importtime format) to `path`.
+    """
+    global _profiler
+    for label, seconds in sorted(_marks.items(), key=lambda item: item[1]):
+        logger.info(f"⏱️ Startup: {label} after {seconds:.2f}s")
+
+    profiler, _profiler = _profiler, None
+    if profiler is None:
+        return None
+    profiler.uninstall()
+
+    total = sum(cumulative for _, _, cumulative, depth in profiler.records if depth == 0)
+    logger.info(f"📦 {len(profiler.records)} modules imported in {total:.2f}s before the first window")
+    slowest = sorted((r for r in profiler.records if r[3] == 0), key=lambda r: r[2], reverse=True)[:top]
+    for module, _, cumulative, _ in slowest:
+        logger.info(f"📦 {cumulative * 1000:8.1f} ms  {module}")
+
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write("import time: self [us] | cumulative | imported package\n")
+            for module, self_s, cumulative, depth in profiler.records:
+                f.write(f"import time: {self_s * 1e6:9.0f} | {cumulative * 1e6:10.0f} | {'  ' * depth}{module}\n")
+            for label, seconds in sorted(_marks.items(), key=lambda item: item[1]):
+                f.write(f"milestone: {label} {seconds:.3f}s\n")
+        logger.info(f"📝 Startup profile written to {path}")
+    except Exception as e:
+        logger.warning(f"⚠️ Could not write startup profile: {e}")
+    return {'imports_s': round(total, 3), 'milestones': dict(_marks)}
@@ -0,0 +1,156 @@
+import time
+import logging
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = 'linkedin_client'
+
+# Labels of the innermost span open in the current thread / context, for set_status()
+_current_labels = contextvars.ContextVar('current_span_labels', default=None)
+
+# Upper bounds in seconds; from quick DOM reads up to the 5 minute operator timeout
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+
+class Histogram:
+    """Cumulative-bucket histogram of span durations, Prometheus style"""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+
+
+class SpanRecorder:
+    """
+    Aggregates span timings into one histogram per (span name, labels).
+    Only aggregates are kept, so recording costs a dict lookup and a few
+    additions regardless of how long the client runs.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, name, seconds, labels=None):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def span(self, name, **labels):
+        """
+        Time the enclosed block as `name`. It is labelled status="error" if
+        it raises, otherwise whatever status the block set on the yielded
+        labels (or through set_status()), "ok" by default.
+        """
+        started = time.perf_counter()
+        token = _current_labels.set(labels)
+        try:
+            yield labels
+        except BaseException:
+            labels['status'] = 'error'
+            raise
+        finally:
+            _current_labels.reset(token)
+            labels.setdefault('status', 'ok')
+            self.observe(name, time.perf_counter() - started, labels)
+
+    def traced(self, name, ok=None, **labels):
+        """
+        Decorator form of span(). For functions that report failure through
+        their return value instead of raising, `ok(result)` decides between
+        status "ok" and "failed".
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name, **labels) as span_labels:
+                    result = func(*args, **kwargs)
+                    if ok is not None and not ok(result):
+                        span_labels.setdefault('status', 'failed')
+                    return result
+            return wrapper
+        return decorator
+
+    def summary(self):
+        """{span: {count, total_s, avg_s}} over all label sets, for logs and /health"""
+        totals = {}
+        with self._lock:
+            for (name, _), histogram in self._histograms.items():
+                entry = totals.setdefault(name, {'count': 0, 'total_s': 0.0})
+                entry['count'] += histogram.count
+                entry['total_s'] += histogram.sum
+        for entry in totals.values():
+            entry['avg_s'] = round(entry['total_s'] / entry['count'], 3) if entry['count'] else 0.0
+            entry['total_s'] = round(entry['total_s'], 3)
+        return totals
+
+    def render_prometheus(self, prefix=METRIC_PREFIX):
+        """Text exposition format (version 0.0.4) for a /metrics route"""
+        metric = f"{prefix}_span_duration_seconds"
+        lines = [
+            f"# HELP {metric} Wall-clock time spent in each instrumented phase.",
+            f"# TYPE {metric} histogram"
+        ]
+        with self._lock:
+            items = sorted(self._histograms.items())
+            for (name, labels), histogram in items:
+                base = [('span', name)] + list(labels)
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f"{metric}_bucket{_labels(base + [('le', f'{bound:g}')])} {count}")
+                lines.append(f"{metric}_bucket{_labels(base + [('le', '+Inf')])} {histogram.count}")
+                lines.append(f"{metric}_sum{_labels(base)} {histogram.sum:.6f}")
+                lines.append(f"{metric}_count{_labels(base)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs):
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+_recorder = SpanRecorder()
+
+
+def get_recorder():
+    """Process-wide span recorder shared by the client, automation and reporter"""
+    return _recorder
+
+
+def span(name, **labels):
+    return _recorder.span(name, **labels)
+
+
+def traced(name, ok=None, **labels):
+    return _recorder.traced(name, ok=ok, **labels)
+
+
+def set_status(status):
+    """Label the innermost open span with `status`, e.g. "failed" from a handled exception"""
+    labels = _current_labels.get()
+    if labels is not None:
+        labels['status'] = status
+
+
+def render_metrics():
+    return _recorder.render_prometheus()